@@ -10,9 +10,11 @@ Provides:
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import logging
 import os
+import threading
 import time
 from collections import defaultdict
 from datetime import timedelta
@@ -49,6 +51,37 @@ def _get_storage_client() -> storage.Client:
     return _storage_client
 
 
+@functools.lru_cache(maxsize=32)
+def get_bucket(bucket_name: str) -> storage.Bucket:
+    """Bucket handle on the process-wide storage client (built on first use)."""
+    return _get_storage_client().bucket(bucket_name)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_signing_credentials():
+    """Default credentials, resolved once per process."""
+    import google.auth
+
+    credentials, _ = google.auth.default()
+    return credentials
+
+
+_signing_refresh_lock = threading.Lock()
+
+
+def _get_signing_token(credentials) -> Optional[str]:
+    """Return a valid access token, refreshing only when it has expired.
+
+    Signing runs in worker threads, so the refresh is serialised.
+    """
+    if getattr(credentials, "service_account_email", None) and not credentials.valid:
+        with _signing_refresh_lock:
+            if not credentials.valid:
+                from google.auth.transport.requests import Request
+                credentials.refresh(Request())
+    return credentials.token
+
+
 def generate_signed_url(
     bucket_name: str,
     blob_path: str,
@@ -67,27 +100,21 @@ def generate_signed_url(
     Returns:
         Signed URL string.
     """
-    import google.auth
-
-    client = _get_storage_client()
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(blob_path)
+    blob = get_bucket(bucket_name).blob(blob_path)
 
     # On Cloud Run, use IAM-based signing (no private key needed).
     # Requires roles/iam.serviceAccountTokenCreator on the compute SA.
-    credentials, project = google.auth.default()
+    # Credentials and their token are cached across calls.
+    credentials = _get_signing_credentials()
     sa_email = getattr(credentials, "service_account_email", None)
-
-    if sa_email and not credentials.token:
-        from google.auth.transport.requests import Request
-        credentials.refresh(Request())
+    access_token = _get_signing_token(credentials)
 
     url = blob.generate_signed_url(
         version="v4",
         expiration=timedelta(hours=expiration_hours),
         method="GET",
         service_account_email=sa_email,
-        access_token=credentials.token,
+        access_token=access_token,
     )
     return url
 
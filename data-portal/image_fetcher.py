@@ -9,6 +9,9 @@ Usage:
     fetcher = ImageFetcher()
     image_bytes = await fetcher.fetch_image(manifest_doc)
     optimized = fetcher.optimize_image(image_bytes)
+
+    # Or stream straight into the optimizer without keeping the raw bytes:
+    optimized = await fetcher.fetch_and_optimize(manifest_doc)
 """
 
 from __future__ import annotations
@@ -21,12 +24,18 @@ from typing import Optional
 import aiohttp
 from PIL import Image
 
+try:
+    import pyvips
+except (ImportError, OSError):  # libvips not installed — Pillow fallback
+    pyvips = None
+
 logger = logging.getLogger("data-portal.image-fetcher")
 
 # Max retries for transient failures
 MAX_RETRIES = 3
 RETRY_BACKOFF = [1.0, 3.0, 10.0]
 REQUEST_TIMEOUT = 30
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
 
 
 class ImageFetcher:
@@ -61,6 +70,40 @@ class ImageFetcher:
         Raises:
             ImageFetchError: If all retry attempts fail.
         """
+        buf = await self._download(await self._resolve_url(manifest_doc))
+        return buf.getvalue()
+
+    async def fetch_and_optimize(
+        self,
+        manifest_doc: dict,
+        max_dim: int = 2048,
+        quality: int = 90,
+        output_format: str = "JPEG",
+    ) -> bytes:
+        """Fetch an image and optimize it in one step.
+
+        The download is streamed into a single buffer and released as soon
+        as optimization ends. libvips decodes straight from that buffer;
+        the Pillow fallback takes one copy of it first.
+
+        Returns:
+            Optimized image bytes (see ``optimize_image``).
+
+        Raises:
+            ImageFetchError: If all retry attempts fail.
+        """
+        buf = await self._download(await self._resolve_url(manifest_doc))
+        view = buf.getbuffer()
+        try:
+            return await asyncio.to_thread(
+                self.optimize_image, view, max_dim, quality, output_format,
+            )
+        finally:
+            view.release()
+            buf.close()
+
+    async def _resolve_url(self, manifest_doc: dict) -> str:
+        """Resolve the direct image URL for a manifest doc."""
         url = manifest_doc.get("image_source_url", "")
         source_type = manifest_doc.get("image_source_type", "direct_url")
 
@@ -74,7 +117,10 @@ class ImageFetcher:
             url = self._normalize_iiif_url(url)
         elif source_type == "ids_service":
             url = self._normalize_ids_url(url)
+        return url
 
+    async def _download(self, url: str) -> io.BytesIO:
+        """Stream an image into a buffer, retrying transient failures."""
         session = await self._get_session()
 
         for attempt in range(MAX_RETRIES):
@@ -84,10 +130,13 @@ class ImageFetcher:
                     timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
                 ) as resp:
                     if resp.status == 200:
-                        data = await resp.read()
-                        if len(data) < 1000:
-                            raise ImageFetchError(f"Suspiciously small image ({len(data)} bytes): {url}")
-                        return data
+                        buf = io.BytesIO()
+                        async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                            buf.write(chunk)
+                        size = buf.tell()
+                        if size < 1000:
+                            raise ImageFetchError(f"Suspiciously small image ({size} bytes): {url}")
+                        return buf
                     elif resp.status in (404, 410):
                         raise ImageFetchError(f"Image not found (HTTP {resp.status}): {url}")
                     else:
@@ -102,13 +151,17 @@ class ImageFetcher:
 
     @staticmethod
     def optimize_image(
-        image_bytes: bytes,
+        image_bytes: bytes | memoryview,
         max_dim: int = 2048,
         quality: int = 90,
         output_format: str = "JPEG",
     ) -> bytes:
         """Resize and compress an image.
 
+        Uses libvips (streaming decode, shrink-on-load) when pyvips is
+        available, otherwise Pillow. CPU-bound — call via
+        ``asyncio.to_thread`` from async code.
+
         Args:
             image_bytes: Raw image data.
             max_dim: Maximum dimension (width or height).
@@ -118,6 +171,36 @@ class ImageFetcher:
         Returns:
             Optimized image bytes.
         """
+        if pyvips is not None:
+            try:
+                return ImageFetcher._optimize_vips(image_bytes, max_dim, quality, output_format)
+            except pyvips.Error as e:
+                logger.warning("libvips optimize failed, falling back to Pillow: %s", e)
+        return ImageFetcher._optimize_pil(image_bytes, max_dim, quality, output_format)
+
+    @staticmethod
+    def _optimize_vips(image_bytes: bytes | memoryview, max_dim: int, quality: int, output_format: str) -> bytes:
+        """libvips optimize path: thumbnail on load, then encode.
+
+        A memory source reads ``image_bytes`` in place (``thumbnail_buffer``
+        would copy it into a GLib blob first).
+        """
+        source = pyvips.Source.new_from_memory(image_bytes)
+        img = pyvips.Image.thumbnail_source(source, max_dim, height=max_dim, size="down")
+
+        # Match the Pillow path: drop alpha, normalise to sRGB or greyscale
+        if img.hasalpha():
+            img = img.flatten(background=[255])
+        if img.interpretation not in ("srgb", "b-w"):
+            img = img.colourspace("srgb")
+
+        if output_format == "PNG":
+            return img.pngsave_buffer(compression=9, strip=True)
+        return img.jpegsave_buffer(Q=quality, optimize_coding=True, strip=True)
+
+    @staticmethod
+    def _optimize_pil(image_bytes: bytes | memoryview, max_dim: int, quality: int, output_format: str) -> bytes:
+        """Pillow optimize path (full decode, then resize)."""
         img = Image.open(io.BytesIO(image_bytes))
 
         # Convert to RGB if needed (e.g., RGBA PNGs, palette images)
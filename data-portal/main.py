@@ -8,14 +8,17 @@ MCP server for agent discovery, and AB 2013 compliance manifests.
 GCP Project: the-golden-codex-1111
 """
 
+import asyncio
 import os
 import logging
 from contextlib import asynccontextmanager
 
+import httpx
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from google.cloud import firestore
 
+from exiftool_daemon import ExifToolDaemon
 from routes.catalog import router as catalog_router
 from routes.agent import router as agent_router
 from routes.orders import router as orders_router
@@ -42,6 +45,7 @@ BASE_WALLET_ADDRESS = os.environ.get(
     "BASE_WALLET_ADDRESS", "0xFE141943a93c184606F3060103D975662327063B"
 )
 DATA_BUCKET = os.environ.get("DATA_BUCKET", "alexandria-download-1m")
+VOLUME_DB_POOL_SIZE = int(os.environ.get("VOLUME_DB_POOL_SIZE", "4"))
 
 # x402 v2 configuration
 X402_NETWORK = os.environ.get("X402_NETWORK", "eip155:8453")  # Base mainnet
@@ -140,9 +144,32 @@ async def lifespan(app: FastAPI):
     from auth import rate_limiter
     rate_limiter.set_db(db)
 
-    # Connect Firestore to the volume discount tracker
+    # Connect Firestore to the volume discount tracker (starts its write flusher).
+    # It rotates across a small pool of clients, sharing the primary one.
     from volume_tracker import volume_tracker
-    volume_tracker.set_db(db)
+    volume_dbs = [db] + [
+        firestore.AsyncClient(project=GCP_PROJECT, database="golden-codex-database")
+        for _ in range(VOLUME_DB_POOL_SIZE - 1)
+    ]
+    volume_tracker.set_db_pool(volume_dbs)
+
+    # Shared outbound HTTP client for agent pipeline calls (keep-alive + HTTP/2)
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(300.0, connect=10.0),
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+    )
+
+    # Long-lived ExifTool process for the Verilian reader (started on first use)
+    app.state.exiftool = ExifToolDaemon()
+
+    # Prime DNS + TLS to the pipeline agents, then keep them warm
+    from routes.enrich import AGENT_KEEPALIVE_INTERVAL, agent_keepalive_loop, warm_agent_connections
+    await warm_agent_connections(app.state.http)
+    keepalive = (
+        asyncio.create_task(agent_keepalive_loop(app.state.http))
+        if AGENT_KEEPALIVE_INTERVAL > 0 else None
+    )
 
     logger.info("Data Portal ready. bucket=%s x402_network=%s", DATA_BUCKET, X402_NETWORK)
 
@@ -154,6 +181,13 @@ async def lifespan(app: FastAPI):
         yield
 
     logger.info("Shutting down Data Portal")
+    if keepalive:
+        keepalive.cancel()
+    await app.state.http.aclose()
+    await app.state.exiftool.close()
+    await volume_tracker.close()
+    for extra_db in volume_dbs[1:]:
+        extra_db.close()
     if db:
         db.close()
 
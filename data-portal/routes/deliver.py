@@ -13,20 +13,28 @@ GET  /deliver/order/{id}      — Poll order status + download links
 from __future__ import annotations
 
 import asyncio
-import json
+import functools
 import logging
 import os
-import uuid
-from datetime import datetime, timezone
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import httpx
+import orjson
 from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import ORJSONResponse
+from google.api_core.exceptions import PreconditionFailed
+from google.cloud import firestore
 from pydantic import BaseModel, Field
+from uuid6 import uuid7
 
 from auth import (
     BASE_WALLET_ADDRESS,
     generate_signed_url,
+    get_bucket,
     get_client_fingerprint,
     rate_limiter,
     verify_x402_payment,
@@ -41,7 +49,7 @@ from pricing import (
 
 logger = logging.getLogger("data-portal.deliver")
 
-router = APIRouter(prefix="/deliver", tags=["deliver"])
+router = APIRouter(prefix="/deliver", tags=["deliver"], default_response_class=ORJSONResponse)
 
 DATA_BUCKET = os.environ.get("DATA_BUCKET", "alexandria-download-1m")
 NOVA_AGENT_URL = os.environ.get("NOVA_AGENT_URL", "https://nova-agent-172867820131.us-west1.run.app")
@@ -49,12 +57,45 @@ ATLAS_AGENT_URL = os.environ.get("ATLAS_AGENT_URL", "https://atlas-agent-1728678
 
 CACHE_PREFIX = "cache"  # GCS path: cache/{museum}/{object_id}/
 
+# Pre-encoded bodies skip httpx's stdlib json encoder
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Background progress writes: flush at most every N seconds or M artifacts
+PROGRESS_UPDATE_INTERVAL = 2.0
+PROGRESS_UPDATE_BATCH = 5
+
+# Signed download URLs are persisted on the order and reused until close to expiry
+DOWNLOAD_URL_HOURS = 24
+DOWNLOAD_URL_REFRESH_MARGIN = timedelta(minutes=5)
+
+# Orders with a fulfill call in progress on this worker
+_inflight_orders: set[str] = set()
+_inflight_lock = asyncio.Lock()
+
 # Tier pricing for delivery orders
 DELIVERY_TIER_PRICES = {
     "human_standard": 0.05,     # Metadata + optimized image (no enrichment)
     "hybrid_premium": 0.20,     # Metadata + Nova enrichment + Atlas infusion
 }
 
+# Nova/Atlas call resilience: retry transient failures, then trip a breaker
+AGENT_MAX_RETRIES = 3
+AGENT_TIMEOUT = 120.0  # per-call timeout on the shared client
+AGENT_RETRY_BACKOFF = [1.0, 2.0, 4.0]
+AGENT_RETRY_STATUSES = {502, 503, 504}
+BREAKER_FAIL_MAX = 5
+BREAKER_RESET_TIMEOUT = 30.0
+
+# Volume discount by order size, largest threshold first
+_VOLUME_DISCOUNT = [(100, 0.20), (50, 0.10)]
+
+# Orders up to this size are cache-checked before answering fulfill; larger
+# ones are checked by the background task so the response isn't held up
+PREFLIGHT_MAX_ARTIFACTS = 10
+
+# Genesis status is re-evaluated at most once per window
+GENESIS_SNAPSHOT_TTL = 60
+
 
 # ---------------------------------------------------------------------------
 # Request / response models
@@ -79,23 +120,187 @@ class DeliveryOrderRequest(BaseModel):
 # ---------------------------------------------------------------------------
 
 
-def _genesis_info() -> dict:
+@functools.lru_cache(maxsize=1)
+def _genesis_snapshot_for(window: int) -> tuple[bool, int]:
     genesis = is_genesis_epoch()
+    return genesis, genesis_days_remaining() if genesis else 0
+
+
+def _genesis_snapshot() -> tuple[bool, int]:
+    """Return ``(genesis_epoch, days_remaining)``, cached per TTL window."""
+    return _genesis_snapshot_for(int(time.monotonic() // GENESIS_SNAPSHOT_TTL))
+
+
+def _genesis_info() -> dict:
+    genesis, days = _genesis_snapshot()
     return {
         "genesis_epoch": genesis,
-        "genesis_days_remaining": genesis_days_remaining() if genesis else 0,
+        "genesis_days_remaining": days,
     }
 
 
-def _delivery_price(tier: str) -> float:
+def _delivery_price(tier: str, genesis: Optional[bool] = None) -> float:
     base = DELIVERY_TIER_PRICES.get(tier, 0.20)
-    if is_genesis_epoch():
+    if genesis is None:
+        genesis = _genesis_snapshot()[0]
+    if genesis:
         return round(base * GENESIS_DISCOUNT, 2)
     return base
 
 
-def _cache_gcs_prefix(museum: str, object_id: str) -> str:
-    return f"{CACHE_PREFIX}/{museum}/{object_id}/"
+def _price_quote(tier: str, count: int) -> tuple[float, float, float, dict]:
+    """Price an order from a single Genesis snapshot.
+
+    Returns ``(unit_price, discount, total, genesis_info)``.
+    """
+    genesis, days = _genesis_snapshot()
+    unit_price = _delivery_price(tier, genesis)
+    total = round(unit_price * count, 2)
+
+    discount = 0.0
+    for min_count, rate in _VOLUME_DISCOUNT:
+        if count >= min_count:
+            discount = rate
+            break
+    if discount:
+        total = round(total * (1 - discount), 2)
+
+    return unit_price, discount, total, {
+        "genesis_epoch": genesis,
+        "genesis_days_remaining": days,
+    }
+
+
+class AgentUnavailableError(Exception):
+    """Raised when an agent call is skipped or exhausts its retries."""
+    pass
+
+
+class _CircuitBreaker:
+    """In-process circuit breaker for a downstream agent.
+
+    Opens after ``fail_max`` consecutive failed calls and short-circuits
+    further calls for ``reset_timeout`` seconds, then lets one through.
+    """
+
+    def __init__(self, name: str, fail_max: int = BREAKER_FAIL_MAX, reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        if self._opened_at is None:
+            return False
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return False  # half-open: allow a trial call
+        return True
+
+    def record_success(self):
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self):
+        self._failures += 1
+        if self._failures >= self.fail_max:
+            if self._opened_at is None:
+                logger.warning("Circuit breaker '%s' opened after %d failures", self.name, self._failures)
+            self._opened_at = time.monotonic()
+
+
+_nova_breaker = _CircuitBreaker("nova")
+_atlas_breaker = _CircuitBreaker("atlas")
+
+
+async def _post_agent(
+    client: httpx.AsyncClient,
+    breaker: _CircuitBreaker,
+    url: str,
+    body: bytes,
+) -> httpx.Response:
+    """POST a pre-encoded JSON body to an agent with retry + backoff.
+
+    Retries connection errors and 502/503/504 with jittered backoff.
+    Raises AgentUnavailableError if the breaker is open or every attempt
+    fails; other responses are returned for the caller to inspect.
+    """
+    if breaker.is_open:
+        raise AgentUnavailableError(f"{breaker.name} circuit open")
+
+    last_error = ""
+    for attempt in range(AGENT_MAX_RETRIES):
+        try:
+            resp = await client.post(
+                url, content=body, headers=_JSON_HEADERS, timeout=AGENT_TIMEOUT,
+            )
+            if resp.status_code not in AGENT_RETRY_STATUSES:
+                if resp.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                return resp
+            last_error = f"HTTP {resp.status_code}"
+        except httpx.RequestError as e:
+            last_error = str(e) or type(e).__name__
+
+        logger.warning(
+            "%s call attempt %d/%d failed: %s",
+            breaker.name, attempt + 1, AGENT_MAX_RETRIES, last_error,
+        )
+        if attempt < AGENT_MAX_RETRIES - 1:
+            delay = AGENT_RETRY_BACKOFF[attempt]
+            await asyncio.sleep(delay + random.uniform(0, delay))
+
+    breaker.record_failure()
+    raise AgentUnavailableError(f"{breaker.name} failed after {AGENT_MAX_RETRIES} attempts: {last_error}")
+
+
+@dataclass(frozen=True, slots=True)
+class CachePaths:
+    """GCS cache object paths for one artifact, built once and passed around."""
+    prefix: str
+    optimized: str
+    infused: str
+    codex: str
+
+    @classmethod
+    def for_(cls, museum: str, object_id: str) -> CachePaths:
+        prefix = f"{CACHE_PREFIX}/{museum}/{object_id}/"
+        return cls(
+            prefix=prefix,
+            optimized=f"{prefix}optimized.jpg",
+            infused=f"{prefix}infused.png",
+            codex=f"{prefix}golden_codex.json",
+        )
+
+
+# Fulfilled-artifact path keys → download response URL keys
+_DOWNLOAD_URL_KEYS = {
+    "infused_path": "infused_url",
+    "optimized_path": "optimized_url",
+    "json_path": "json_url",
+}
+
+
+async def _claim_order(db, order_id: str, update: dict) -> bool:
+    """Atomically move an order out of ``awaiting_payment``.
+
+    Applies ``update`` inside a Firestore transaction only if the order is
+    still awaiting payment. Returns False if another request got there first.
+    """
+    doc_ref = db.collection("delivery_orders").document(order_id)
+
+    @firestore.async_transactional
+    async def claim_in_txn(txn, ref):
+        doc = await ref.get(transaction=txn)
+        if not doc.exists or doc.to_dict().get("status") != "awaiting_payment":
+            return False
+        txn.update(ref, update)
+        return True
+
+    return await claim_in_txn(db.transaction(), doc_ref)
 
 
 async def _manifest_lookup(db, artifact_id: str) -> Optional[dict]:
@@ -106,28 +311,69 @@ async def _manifest_lookup(db, artifact_id: str) -> Optional[dict]:
     return None
 
 
-async def _check_cache(bucket_obj, museum: str, object_id: str) -> Optional[dict]:
-    """Check if an artifact has already been fetched/enriched in GCS cache."""
-    prefix = _cache_gcs_prefix(museum, object_id)
-    infused_blob = bucket_obj.blob(f"{prefix}infused.png")
-    json_blob = bucket_obj.blob(f"{prefix}golden_codex.json")
+def _check_cache(bucket_obj, paths: CachePaths) -> Optional[dict]:
+    """Check if an artifact has already been fetched/enriched in GCS cache.
+
+    One listing of the artifact's cache prefix answers all three paths.
+    Blocking (GCS API call) — run it in a worker thread.
+    """
+    names = {blob.name for blob in bucket_obj.list_blobs(prefix=paths.prefix)}
 
-    if infused_blob.exists() and json_blob.exists():
+    if paths.infused in names and paths.codex in names:
         return {
-            "infused_path": f"{prefix}infused.png",
-            "json_path": f"{prefix}golden_codex.json",
+            "infused_path": paths.infused,
+            "json_path": paths.codex,
         }
 
     # Check for optimized-only (human_standard without enrichment)
-    optimized_blob = bucket_obj.blob(f"{prefix}optimized.jpg")
-    if optimized_blob.exists():
+    if paths.optimized in names:
         return {
-            "optimized_path": f"{prefix}optimized.jpg",
+            "optimized_path": paths.optimized,
         }
 
     return None
 
 
+def _is_cache_hit(cached: Optional[dict], tier: str) -> bool:
+    """Whether a cache entry satisfies the requested delivery tier."""
+    if not cached:
+        return False
+    if tier == "hybrid_premium":
+        return "infused_path" in cached
+    if tier == "human_standard":
+        return "optimized_path" in cached
+    return False
+
+
+async def _precompute_cache_hits(
+    db, bucket_obj, artifact_ids: list[str], tier: str,
+) -> tuple[dict, list[str]]:
+    """Split an order's artifacts into cache hits and misses up front.
+
+    Returns ``(hits, misses)`` where ``hits`` maps artifact ID to the same
+    ``{"source": "cache", "paths": ...}`` record the fulfillment loop stores.
+    """
+    async def _lookup(aid: str) -> Optional[dict]:
+        manifest = await _manifest_lookup(db, aid)
+        if not manifest:
+            return None
+        paths = CachePaths.for_(manifest.get("museum", ""), manifest.get("object_id", ""))
+        return await asyncio.to_thread(_check_cache, bucket_obj, paths)
+
+    results = await asyncio.gather(
+        *(_lookup(aid) for aid in artifact_ids), return_exceptions=True,
+    )
+
+    hits: dict = {}
+    misses: list[str] = []
+    for aid, cached in zip(artifact_ids, results):
+        if isinstance(cached, Exception) or not _is_cache_hit(cached, tier):
+            misses.append(aid)
+        else:
+            hits[aid] = {"source": "cache", "paths": cached}
+    return hits, misses
+
+
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
@@ -173,21 +419,12 @@ async def create_delivery_order(
             },
         )
 
-    # Calculate price
-    unit_price = _delivery_price(body.tier)
+    # Calculate price (10% off for 50+, 20% off for 100+)
     count = len(body.artifact_ids)
-    total = round(unit_price * count, 2)
-
-    # Volume discount (10% off for 50+, 20% off for 100+)
-    discount = 0.0
-    if count >= 100:
-        discount = 0.20
-    elif count >= 50:
-        discount = 0.10
-    if discount:
-        total = round(total * (1 - discount), 2)
+    unit_price, discount, total, genesis_info = _price_quote(body.tier, count)
 
-    order_id = str(uuid.uuid4())
+    # UUIDv7: time-ordered prefix keeps recent orders adjacent for range scans
+    order_id = str(uuid7())
     now = datetime.now(timezone.utc).isoformat()
 
     order_doc = {
@@ -233,7 +470,7 @@ async def create_delivery_order(
             {"id": aid, "title": doc.get("title", ""), "museum": doc.get("museum", "")}
             for aid, doc in found.items()
         ],
-        **_genesis_info(),
+        **genesis_info,
     }
 
 
@@ -267,39 +504,89 @@ async def fulfill_delivery_order(
     if order.get("status") == "fulfilled":
         return await _build_download_response(order_id, order, request)
 
+    # A retry after fulfillment was claimed gets progress, not an error
+    if order.get("status") == "processing":
+        return await get_delivery_order(order_id, request)
+
     if order.get("status") not in ("awaiting_payment",):
         raise HTTPException(status_code=400, detail=f"Order status is '{order.get('status')}', cannot fulfill")
 
-    # Verify payment
-    total = order.get("total_price", 0)
-    if not x_payment:
-        raise HTTPException(
-            status_code=402,
-            detail={
-                "error": "Payment required",
-                "amount": total,
-                "currency": "USDC",
-                "network": "base",
-                "recipient": BASE_WALLET_ADDRESS,
-            },
-        )
-
-    payment_result = await verify_x402_payment(x_payment, total)
-    if not payment_result.valid:
-        raise HTTPException(
-            status_code=402,
-            detail={"error": "Payment verification failed", "amount": total},
-        )
-
-    # Mark as processing
-    await db.collection("delivery_orders").document(order_id).update({
-        "status": "processing",
-        "payment_tx": payment_result.tx_hash,
-        "fulfillment_started_at": datetime.now(timezone.utc).isoformat(),
-    })
+    # A concurrent fulfill call still in payment verification on this worker
+    # gets the order's status
+    async with _inflight_lock:
+        if order_id in _inflight_orders:
+            return await get_delivery_order(order_id, request)
+        _inflight_orders.add(order_id)
 
-    # Fire background fulfillment
-    asyncio.create_task(_fulfill_order_background(db, order_id, order, request.state.data_bucket))
+    spawned = False
+    try:
+        # Verify payment
+        total = order.get("total_price", 0)
+        if not x_payment:
+            raise HTTPException(
+                status_code=402,
+                detail={
+                    "error": "Payment required",
+                    "amount": total,
+                    "currency": "USDC",
+                    "network": "base",
+                    "recipient": BASE_WALLET_ADDRESS,
+                },
+            )
+
+        payment_result = await verify_x402_payment(x_payment, total)
+        if not payment_result.valid:
+            raise HTTPException(
+                status_code=402,
+                detail={"error": "Payment verification failed", "amount": total},
+            )
+
+        # Pre-flight cache check on small orders: fully cached ones are
+        # fulfilled inline. Larger orders leave the check to the background task.
+        bucket_name = request.state.data_bucket
+        artifact_ids = order.get("artifact_ids", [])
+        hits: Optional[dict] = None
+        misses = artifact_ids
+        if len(artifact_ids) <= PREFLIGHT_MAX_ARTIFACTS:
+            bucket_obj = await asyncio.to_thread(get_bucket, bucket_name)
+            hits, misses = await _precompute_cache_hits(
+                db, bucket_obj, artifact_ids, order.get("tier", "hybrid_premium"),
+            )
+
+        if not misses:
+            now = datetime.now(timezone.utc).isoformat()
+            update = {
+                "status": "fulfilled",
+                "payment_tx": payment_result.tx_hash,
+                "fulfillment_started_at": now,
+                "fulfilled_at": now,
+                "fulfilled_artifacts": hits,
+                "errors": None,
+            }
+            if not await _claim_order(db, order_id, update):
+                return await get_delivery_order(order_id, request)
+            order.update(update)
+            logger.info("Order %s: all %d artifacts served from cache", order_id, len(hits))
+            return await _build_download_response(order_id, order, request)
+
+        # Mark as processing — only the request that wins the transition spawns work
+        claimed = await _claim_order(db, order_id, {
+            "status": "processing",
+            "payment_tx": payment_result.tx_hash,
+            "fulfillment_started_at": datetime.now(timezone.utc).isoformat(),
+        })
+        if not claimed:
+            return await get_delivery_order(order_id, request)
+
+        # Fire background fulfillment for the cache misses only
+        asyncio.create_task(_fulfill_order_background(
+            db, order_id, order, bucket_name, request.app.state.http, cached=hits,
+        ))
+        spawned = True
+    finally:
+        if not spawned:
+            async with _inflight_lock:
+                _inflight_orders.discard(order_id)
 
     return {
         "order_id": order_id,
@@ -355,35 +642,60 @@ async def get_delivery_order(
 # ---------------------------------------------------------------------------
 
 
-async def _fulfill_order_background(db, order_id: str, order: dict, bucket_name: str):
-    """Process each artifact in an order: fetch, optimize, enrich, cache."""
-    from google.cloud import storage as gcs
-
-    client = gcs.Client()
-    bucket_obj = client.bucket(bucket_name)
+async def _fulfill_order_background(
+    db,
+    order_id: str,
+    order: dict,
+    bucket_name: str,
+    client: httpx.AsyncClient,
+    cached: Optional[dict] = None,
+):
+    """Process each artifact in an order: fetch, optimize, enrich, cache.
 
+    Artifacts already present in ``cached`` (from the pre-flight cache
+    check) are recorded as fulfilled without being fetched again. When
+    ``cached`` is None the pre-flight was skipped and runs here instead.
+    """
     artifact_ids = order.get("artifact_ids", [])
     tier = order.get("tier", "hybrid_premium")
-    fulfilled = {}
     errors = {}
-
     fetcher = ImageFetcher()
 
     try:
+        bucket_obj = await asyncio.to_thread(get_bucket, bucket_name)
+        if cached is None:
+            cached, _ = await _precompute_cache_hits(db, bucket_obj, artifact_ids, tier)
+        fulfilled = dict(cached)
+
+        # Entries not yet written to Firestore; flushed as per-field deltas
+        pending = dict(fulfilled)
+        last_update_ts = 0.0
+
         for aid in artifact_ids:
+            if aid in fulfilled:
+                continue
             try:
                 result = await _process_single_artifact(
-                    db, fetcher, bucket_obj, bucket_name, aid, tier,
+                    db, fetcher, client, bucket_obj, bucket_name, aid, tier,
                 )
                 fulfilled[aid] = result
+                pending[aid] = result
             except Exception as e:
                 logger.error("Failed to process artifact %s: %s", aid, e)
                 errors[aid] = str(e)
 
-            # Update progress incrementally
-            await db.collection("delivery_orders").document(order_id).update({
-                "fulfilled_artifacts": fulfilled,
-            })
+            # Update progress incrementally (throttled, delta-only)
+            now_ts = time.monotonic()
+            if pending and (
+                now_ts - last_update_ts >= PROGRESS_UPDATE_INTERVAL
+                or len(pending) >= PROGRESS_UPDATE_BATCH
+            ):
+                await db.collection("delivery_orders").document(order_id).update({
+                    firestore.FieldPath("fulfilled_artifacts", k).to_api_repr(): v
+                    for k, v in pending.items()
+                })
+                pending.clear()
+                last_update_ts = now_ts
 
         # Mark order complete
         status = "fulfilled" if fulfilled else "failed"
@@ -407,47 +719,46 @@ async def _fulfill_order_background(db, order_id: str, order: dict, bucket_name:
         })
     finally:
         await fetcher.close()
+        async with _inflight_lock:
+            _inflight_orders.discard(order_id)
 
 
 async def _process_single_artifact(
     db,
     fetcher: ImageFetcher,
+    client: httpx.AsyncClient,
     bucket_obj,
     bucket_name: str,
     artifact_id: str,
     tier: str,
 ) -> dict:
-    """Process a single artifact: fetch, optimize, enrich (if premium), cache."""
+    """Process a single artifact: fetch, optimize, enrich (if premium), cache.
+
+    Cache hits are filtered out up front by ``_precompute_cache_hits``.
+    Cache writes use ``if_generation_match=0`` so that when two workers
+    race on the same artifact, the loser finds the peer's objects instead
+    of overwriting them.
+    """
 
     # 1. Load manifest doc
     manifest = await _manifest_lookup(db, artifact_id)
     if not manifest:
         raise ValueError(f"Artifact {artifact_id} not found in manifest")
 
-    museum = manifest.get("museum", "")
-    object_id = manifest.get("object_id", "")
-    prefix = _cache_gcs_prefix(museum, object_id)
+    paths = CachePaths.for_(manifest.get("museum", ""), manifest.get("object_id", ""))
 
-    # 2. Check cache
-    cached = await asyncio.get_event_loop().run_in_executor(
-        None, lambda: _check_cache(bucket_obj, museum, object_id)
-    )
+    # 2-3. Fetch image from museum and optimize (raw bytes released after decode)
+    optimized = await fetcher.fetch_and_optimize(manifest, max_dim=2048, quality=90)
 
-    if cached and "infused_path" in cached and tier == "hybrid_premium":
-        return {"source": "cache", "paths": cached}
-    if cached and "optimized_path" in cached and tier == "human_standard":
-        return {"source": "cache", "paths": cached}
-
-    # 3. Fetch image from museum
-    image_bytes = await fetcher.fetch_image(manifest)
-
-    # 4. Optimize
-    optimized = fetcher.optimize_image(image_bytes, max_dim=2048, quality=90)
-
-    # Upload optimized image to cache
-    opt_path = f"{prefix}optimized.jpg"
+    # 4. Upload optimized image to cache (create-only)
+    opt_path = paths.optimized
     opt_blob = bucket_obj.blob(opt_path)
-    opt_blob.upload_from_string(optimized, content_type="image/jpeg")
+    try:
+        opt_blob.upload_from_string(optimized, content_type="image/jpeg", if_generation_match=0)
+    except PreconditionFailed:
+        logger.info("Artifact %s optimized image already uploaded by peer worker", artifact_id)
+        if tier == "human_standard":
+            return {"source": "cache", "paths": {"optimized_path": opt_path}}
 
     result = {"optimized_path": opt_path}
 
@@ -462,8 +773,11 @@ async def _process_single_artifact(
         # Nova enrichment
         golden_codex = {}
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                nova_resp = await client.post(f"{NOVA_AGENT_URL}/enrich", json={
+            nova_resp = await _post_agent(
+                client,
+                _nova_breaker,
+                f"{NOVA_AGENT_URL}/enrich",
+                orjson.dumps({
                     "image_url": temp_url,
                     "user_id": "delivery_pipeline",
                     "image_id": artifact_id,
@@ -476,9 +790,10 @@ async def _process_single_artifact(
                         "museum": manifest.get("museum", ""),
                         "museum_url": manifest.get("museum_url", ""),
                     },
-                })
-                if nova_resp.status_code == 200:
-                    golden_codex = nova_resp.json().get("golden_codex", {})
+                }),
+            )
+            if nova_resp.status_code == 200:
+                golden_codex = orjson.loads(nova_resp.content).get("golden_codex", {})
         except Exception as e:
             logger.warning("Nova enrichment failed for %s: %s", artifact_id, e)
             # Continue without enrichment — still deliver the optimized image
@@ -488,37 +803,53 @@ async def _process_single_artifact(
                 "_enrichment_status": "nova_unavailable",
             }
 
-        # Save Golden Codex JSON to cache
-        json_path = f"{prefix}golden_codex.json"
+        # Save Golden Codex JSON to cache (create-only)
+        json_path = paths.codex
         json_blob = bucket_obj.blob(json_path)
-        json_blob.upload_from_string(
-            json.dumps(golden_codex, indent=2, ensure_ascii=False),
-            content_type="application/json",
-        )
+        codex_bytes = orjson.dumps(golden_codex, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        try:
+            json_blob.upload_from_string(
+                codex_bytes, content_type="application/json", if_generation_match=0,
+            )
+        except PreconditionFailed:
+            if await asyncio.to_thread(bucket_obj.blob(paths.infused).exists):
+                logger.info("Artifact %s already enriched by peer worker", artifact_id)
+                return {
+                    "source": "cache",
+                    "paths": {"infused_path": paths.infused, "json_path": json_path},
+                }
+            # Leftover codex from an incomplete earlier run — replace it
+            await asyncio.to_thread(
+                json_blob.upload_from_string, codex_bytes, content_type="application/json",
+            )
         result["json_path"] = json_path
 
         # Atlas infusion (XMP embed)
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                atlas_resp = await client.post(f"{ATLAS_AGENT_URL}/infuse", json={
+            atlas_resp = await _post_agent(
+                client,
+                _atlas_breaker,
+                f"{ATLAS_AGENT_URL}/infuse",
+                orjson.dumps({
                     "image_url": temp_url,
                     "user_id": "delivery_pipeline",
                     "golden_codex": golden_codex,
                     "metadata_mode": "full_gcx",
-                })
-                if atlas_resp.status_code == 200:
-                    atlas_data = atlas_resp.json()
-                    final_url = atlas_data.get("final_url", "")
-                    if final_url:
-                        result["infused_path"] = f"{prefix}infused.png"
-                        # Atlas stores the infused file; we record its path
-                        result["soulmark"] = atlas_data.get("soulmark", "")
-                        result["phash"] = atlas_data.get("perceptual_hash", "")
-                    else:
-                        # Atlas didn't return a final URL; copy optimized as fallback
-                        result["infused_path"] = opt_path
+                }, option=orjson.OPT_NON_STR_KEYS),
+            )
+            if atlas_resp.status_code == 200:
+                atlas_data = orjson.loads(atlas_resp.content)
+                final_url = atlas_data.get("final_url", "")
+                if final_url:
+                    result["infused_path"] = paths.infused
+                    # Atlas stores the infused file; we record its path
+                    result["soulmark"] = atlas_data.get("soulmark", "")
+                    result["phash"] = atlas_data.get("perceptual_hash", "")
                 else:
+                    # Atlas didn't return a final URL; copy optimized as fallback
                     result["infused_path"] = opt_path
+            else:
+                result["infused_path"] = opt_path
         except Exception as e:
             logger.warning("Atlas infusion failed for %s: %s", artifact_id, e)
             result["infused_path"] = opt_path
@@ -526,7 +857,7 @@ async def _process_single_artifact(
     # 6. Update manifest with cache info
     await db.collection("alexandria_manifest").document(artifact_id).update({
         "cached": True,
-        "cache_path": prefix,
+        "cache_path": paths.prefix,
         "last_fulfilled": datetime.now(timezone.utc).isoformat(),
     })
 
@@ -534,31 +865,91 @@ async def _process_single_artifact(
     return result
 
 
-async def _build_download_response(order_id: str, order: dict, request: Request) -> dict:
-    """Build response with signed download URLs for a fulfilled order."""
-    bucket = request.state.data_bucket
-    fulfilled = order.get("fulfilled_artifacts", {})
+def _sign_or_fallback(bucket: str, path: str) -> tuple[str, bool]:
+    """Return ``(url, signed)``; a gs:// URL stands in when signing fails."""
+    try:
+        return generate_signed_url(bucket, path, expiration_hours=DOWNLOAD_URL_HOURS), True
+    except Exception:
+        return f"gs://{bucket}/{path}", False
+
+
+def _cached_download_urls(order: dict) -> Optional[list]:
+    """Return previously signed downloads if they are not close to expiry."""
+    cached = order.get("download_urls")
+    if not isinstance(cached, dict):
+        return None
+    try:
+        expires_at = datetime.fromisoformat(cached["expires_at"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if datetime.now(timezone.utc) >= expires_at - DOWNLOAD_URL_REFRESH_MARGIN:
+        return None
+    return cached.get("downloads")
+
+
+async def _sign_downloads(bucket: str, fulfilled: dict) -> tuple[list, bool]:
+    """Sign every download URL for an order concurrently.
+
+    Returns ``(downloads, all_signed)``; ``all_signed`` is False when any
+    URL fell back to gs://.
+    """
     downloads = []
+    to_sign = []  # (download dict, url key, blob path)
 
     for aid, info in fulfilled.items():
         paths = info if isinstance(info, dict) else {}
+        # Cache hits nest their paths under "paths"; fresh results are flat
+        paths = paths.get("paths", paths)
         dl = {"artifact_id": aid}
 
-        # Generate signed URLs for available files
-        for key in ("infused_path", "optimized_path", "json_path"):
+        for key, url_key in _DOWNLOAD_URL_KEYS.items():
             path = paths.get(key, "")
             if path:
-                try:
-                    url = generate_signed_url(bucket, path, expiration_hours=24)
-                except Exception:
-                    url = f"gs://{bucket}/{path}"
-                dl[key.replace("_path", "_url")] = url
+                to_sign.append((dl, url_key, path))
 
         if paths.get("soulmark"):
             dl["soulmark"] = paths["soulmark"]
 
         downloads.append(dl)
 
+    results = await asyncio.gather(*(
+        asyncio.to_thread(_sign_or_fallback, bucket, path) for _, _, path in to_sign
+    ))
+    all_signed = True
+    for (dl, url_key, _), (url, signed) in zip(to_sign, results):
+        dl[url_key] = url
+        all_signed = all_signed and signed
+
+    return downloads, all_signed
+
+
+async def _build_download_response(order_id: str, order: dict, request: Request) -> dict:
+    """Build response with signed download URLs for a fulfilled order.
+
+    URLs are signed once and stored on the order doc; later polls reuse
+    them until they are within a few minutes of expiring. A set with any
+    unsigned fallback URL is not stored, so the next poll signs again.
+    """
+    downloads = _cached_download_urls(order)
+
+    if downloads is None:
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=DOWNLOAD_URL_HOURS)
+        downloads, all_signed = await _sign_downloads(
+            request.state.data_bucket, order.get("fulfilled_artifacts", {}),
+        )
+        if not all_signed:
+            logger.warning("Order %s: some download URLs could not be signed; not caching", order_id)
+        else:
+            try:
+                await request.state.db.collection("delivery_orders").document(order_id).update({
+                    "download_urls": {
+                        "downloads": downloads,
+                        "expires_at": expires_at.isoformat(),
+                    },
+                })
+            except Exception as e:
+                logger.warning("Order %s: could not cache download URLs: %s", order_id, e)
+
     return {
         "order_id": order_id,
         "status": "fulfilled",
@@ -25,16 +25,23 @@ Pricing (x402 USDC on Base L2):
 from __future__ import annotations
 
 import asyncio
-import json
+import hmac
 import logging
 import os
+import random
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from itertools import islice
 from typing import Optional
 
 import httpx
-from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Request, UploadFile, File
-from pydantic import BaseModel, Field
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request, Response, UploadFile, File
+from google.cloud import firestore
+from pydantic import BaseModel, ConfigDict, Field
+
+from auth import verify_x402_payment
 
 logger = logging.getLogger("data-portal.enrich")
 
@@ -46,6 +53,26 @@ ATLAS_AGENT_URL = os.environ.get("ATLAS_AGENT_URL", "https://atlas-agent-1728678
 ARCHIVUS_AGENT_URL = os.environ.get("ARCHIVUS_AGENT_URL", "https://archivus-agent-172867820131.us-west1.run.app")
 MINTRA_AGENT_URL = os.environ.get("MINTRA_AGENT_URL", "https://mintra-agent-172867820131.us-west1.run.app")
 
+# Durable pipeline dispatch via Cloud Tasks. When ENRICH_TASKS_QUEUE is unset
+# (local dev), pipelines fall back to in-process BackgroundTasks.
+ENRICH_TASKS_QUEUE = os.environ.get("ENRICH_TASKS_QUEUE", "")  # projects/{p}/locations/{l}/queues/{q}
+ENRICH_WORKER_URL = os.environ.get("ENRICH_WORKER_URL", "")    # Base URL of the worker service
+ENRICH_WORKER_KEY = os.environ.get("ENRICH_WORKER_KEY", "")
+WORKER_DISPATCH_DEADLINE = 1800  # seconds (Cloud Tasks HTTP target maximum)
+# How long a worker's claim on a job holds off redeliveries. Must outlast the
+# slowest pipeline (4 attempts x 300 s x 4 rounds, plus backoff), which can
+# run past WORKER_DISPATCH_DEADLINE and so be redelivered while still running.
+JOB_LEASE_SECONDS = int(os.environ.get("ENRICH_JOB_LEASE_SECONDS", "5400"))
+
+AGENT_KEEPALIVE_INTERVAL = int(os.environ.get("AGENT_KEEPALIVE_INTERVAL", "60"))  # 0 disables
+
+FIRESTORE_BATCH_LIMIT = 500  # Max writes per Firestore batch commit
+BATCH_MAX_CONCURRENCY = int(os.environ.get("BATCH_MAX_CONCURRENCY", "16"))
+BATCH_JOBS_PAGE_SIZE = 100   # Jobs listed per page on batch status polls
+
+# Encoded status responses for terminal (immutable) jobs
+_terminal_cache: TTLCache[str, bytes] = TTLCache(maxsize=10_000, ttl=300)
+
 
 # ── Enrichment tier definitions ───────────────────────────────────────────
 
@@ -92,6 +119,8 @@ ENRICHMENT_TIERS = {
 
 class EnrichRequest(BaseModel):
     """Single image enrichment request."""
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True)
+
     image_url: Optional[str] = Field(default=None, description="Public URL of image to enrich")
     tier: str = Field(default="certified", description="Enrichment tier: nest_only, certified, or full_pipeline")
     callback_url: Optional[str] = Field(default=None, description="Webhook URL for async completion notification")
@@ -100,34 +129,131 @@ class EnrichRequest(BaseModel):
 
 class BatchEnrichRequest(BaseModel):
     """Batch enrichment request."""
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True)
+
     images: list[dict] = Field(description="List of {image_url, metadata} objects")
     tier: str = Field(default="full_pipeline")
     callback_url: Optional[str] = None
 
 
+# ── Payment ───────────────────────────────────────────────────────────────
+
+# Pre-built 402 envelopes per tier (unpaid requests are mostly bot scans)
+_X402_BODIES = {
+    name: {
+        "error": "Payment required",
+        "x402": {
+            "version": "1.0",
+            "amount": str(cfg["price_usdc"]),
+            "currency": "USDC",
+            "network": "base",
+            "description": f"Golden Codex enrichment: {cfg['name']}",
+            "facilitator": "https://x402.org/facilitator",
+        },
+    }
+    for name, cfg in ENRICHMENT_TIERS.items()
+}
+
+_INVALID_TIER_DETAIL = "Invalid tier '{}'. Options: " + str(list(ENRICHMENT_TIERS))
+
+
+async def _x402_payment_header(
+    x_payment: Optional[str] = Header(None, alias="X-PAYMENT"),
+    payment_sig: Optional[str] = Header(None, alias="PAYMENT-SIGNATURE"),
+) -> Optional[str]:
+    """Dependency: the x402 payment header (V2: PAYMENT-SIGNATURE, V1: X-PAYMENT)."""
+    return payment_sig or x_payment
+
+
+def _lookup_tier(tier_name: str) -> dict:
+    """Return the tier config or raise 400."""
+    tier = ENRICHMENT_TIERS.get(tier_name)
+    if not tier:
+        raise HTTPException(status_code=400, detail=_INVALID_TIER_DETAIL.format(tier_name))
+    return tier
+
+
 # ── Routes ────────────────────────────────────────────────────────────────
 
 
+# Static discovery payloads — serialized once at import
+_TIERS_BYTES = orjson.dumps({
+    "tiers": ENRICHMENT_TIERS,
+    "density_imperative": {
+        "summary": "Our NEST enrichment produces 111-field structured metadata (2,000-4,000 tokens). "
+        "Peer-reviewed research shows this improves VLM visual perception by +25.5%, "
+        "semantic coverage by +160.3%, and explanation quality by +124.8%. "
+        "Sparse captions (~50 tokens) actively destroy model capabilities by -54.4%.",
+        "paper_doi": "10.5281/zenodo.18667735",
+        "key_metric": "63-point CogBench cognitive swing between sparse and dense conditions",
+        "metrics_url": "/v1/enrich/research",
+    },
+    "payment": {
+        "protocol": "x402",
+        "currency": "USDC",
+        "network": "Base L2",
+    },
+})
+
+_RESEARCH_BYTES = orjson.dumps({
+    "paper": {
+        "title": "The Density Imperative: How Semantic Curation Depth Determines Vision-Language Model Capability",
+        "author": "Tad MacPherson, Metavolve Labs, Inc.",
+        "doi": "10.5281/zenodo.18667735",
+        "status": "Under review, DMLR 2026",
+    },
+    "experiment": {
+        "model": "Llama 3.2 11B Vision-Instruct",
+        "dataset": "9,081 Alexandria Aeternum images (identical across conditions)",
+        "variable": "Metadata density only (same images, model, hyperparameters)",
+    },
+    "headline_results": {
+        "cogbench_swing": {
+            "sparse": 0.174,
+            "dense": 0.415,
+            "delta": "63 points (141% improvement)",
+            "significance": "Friedman p < .001, n=100",
+        },
+        "semantic_coverage": {
+            "sparse_vs_base": "-72% (destroyed)",
+            "dense_vs_base": "+160.3% (enhanced)",
+            "emotional_coverage_gain": "+282.1%",
+            "narrative_coverage_gain": "+196.3%",
+        },
+        "hallucination_rate": {
+            "base": "1.0%",
+            "sparse": "4.3% (+330%)",
+            "dense": "1.3% (+30%)",
+        },
+        "visual_perception": {
+            "sparse_vs_base": "-45.9%",
+            "dense_vs_base": "+25.5%",
+        },
+        "explanation_quality": "+124.8% improvement with 15.4% fewer tokens",
+    },
+    "key_insight": "Dense structured metadata teaches models HOW TO THINK, "
+    "not what to say. The learned capability is methodological, not memorized. "
+    "Group B applies 8-section analytical methodology to held-out images "
+    "it never saw during training.",
+    "warning": "Sparse fine-tuning (alt-text, short captions) does not merely fail "
+    "to help — it ACTIVELY DESTROYS pre-trained capabilities. "
+    "We do not sell sparse data. We never will.",
+    "our_solution": {
+        "nest_schema": "111-field Neural Extraction of Semantic Topology",
+        "tokens_per_image": "2,000-4,000",
+        "enrichment_models": "Gemini 2.5 Pro (analytical) + GPT-4o (artistic voice) + Claude (intimate reading)",
+        "api_endpoint": "/v1/enrich",
+        "on_demand": True,
+    },
+})
+
+_STATIC_CACHE_HEADERS = {"Cache-Control": "public, max-age=3600"}
+
+
 @router.get("/tiers")
 async def list_enrichment_tiers():
     """List available enrichment tiers with pricing and capabilities."""
-    return {
-        "tiers": ENRICHMENT_TIERS,
-        "density_imperative": {
-            "summary": "Our NEST enrichment produces 111-field structured metadata (2,000-4,000 tokens). "
-            "Peer-reviewed research shows this improves VLM visual perception by +25.5%, "
-            "semantic coverage by +160.3%, and explanation quality by +124.8%. "
-            "Sparse captions (~50 tokens) actively destroy model capabilities by -54.4%.",
-            "paper_doi": "10.5281/zenodo.18667735",
-            "key_metric": "63-point CogBench cognitive swing between sparse and dense conditions",
-            "metrics_url": "/v1/enrich/research",
-        },
-        "payment": {
-            "protocol": "x402",
-            "currency": "USDC",
-            "network": "Base L2",
-        },
-    }
+    return Response(content=_TIERS_BYTES, media_type="application/json", headers=_STATIC_CACHE_HEADERS)
 
 
 @router.get("/research")
@@ -137,57 +263,7 @@ async def density_imperative_research():
     These numbers are why we exist. Sparse metadata lobotomizes VLMs.
     Dense NEST metadata teaches them how to think.
     """
-    return {
-        "paper": {
-            "title": "The Density Imperative: How Semantic Curation Depth Determines Vision-Language Model Capability",
-            "author": "Tad MacPherson, Metavolve Labs, Inc.",
-            "doi": "10.5281/zenodo.18667735",
-            "status": "Under review, DMLR 2026",
-        },
-        "experiment": {
-            "model": "Llama 3.2 11B Vision-Instruct",
-            "dataset": "9,081 Alexandria Aeternum images (identical across conditions)",
-            "variable": "Metadata density only (same images, model, hyperparameters)",
-        },
-        "headline_results": {
-            "cogbench_swing": {
-                "sparse": 0.174,
-                "dense": 0.415,
-                "delta": "63 points (141% improvement)",
-                "significance": "Friedman p < .001, n=100",
-            },
-            "semantic_coverage": {
-                "sparse_vs_base": "-72% (destroyed)",
-                "dense_vs_base": "+160.3% (enhanced)",
-                "emotional_coverage_gain": "+282.1%",
-                "narrative_coverage_gain": "+196.3%",
-            },
-            "hallucination_rate": {
-                "base": "1.0%",
-                "sparse": "4.3% (+330%)",
-                "dense": "1.3% (+30%)",
-            },
-            "visual_perception": {
-                "sparse_vs_base": "-45.9%",
-                "dense_vs_base": "+25.5%",
-            },
-            "explanation_quality": "+124.8% improvement with 15.4% fewer tokens",
-        },
-        "key_insight": "Dense structured metadata teaches models HOW TO THINK, "
-        "not what to say. The learned capability is methodological, not memorized. "
-        "Group B applies 8-section analytical methodology to held-out images "
-        "it never saw during training.",
-        "warning": "Sparse fine-tuning (alt-text, short captions) does not merely fail "
-        "to help — it ACTIVELY DESTROYS pre-trained capabilities. "
-        "We do not sell sparse data. We never will.",
-        "our_solution": {
-            "nest_schema": "111-field Neural Extraction of Semantic Topology",
-            "tokens_per_image": "2,000-4,000",
-            "enrichment_models": "Gemini 2.5 Pro (analytical) + GPT-4o (artistic voice) + Claude (intimate reading)",
-            "api_endpoint": "/v1/enrich",
-            "on_demand": True,
-        },
-    }
+    return Response(content=_RESEARCH_BYTES, media_type="application/json", headers=_STATIC_CACHE_HEADERS)
 
 
 @router.post("")
@@ -195,8 +271,7 @@ async def enrich_image(
     body: EnrichRequest,
     request: Request,
     background_tasks: BackgroundTasks,
-    x_payment: Optional[str] = Header(None, alias="X-PAYMENT"),
-    payment_sig: Optional[str] = Header(None, alias="PAYMENT-SIGNATURE"),
+    x_payment: Optional[str] = Depends(_x402_payment_header),
 ):
     """Submit an image for Golden Codex enrichment.
 
@@ -206,32 +281,11 @@ async def enrich_image(
     This is an async operation. You'll receive a job_id to poll for results,
     or provide a callback_url for webhook notification on completion.
     """
-    if body.tier not in ENRICHMENT_TIERS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid tier '{body.tier}'. Options: {list(ENRICHMENT_TIERS.keys())}",
-        )
-
-    tier = ENRICHMENT_TIERS[body.tier]
+    tier = _lookup_tier(body.tier)
     required_amount = tier["price_usdc"]
 
-    # Verify x402 payment (V2: PAYMENT-SIGNATURE, V1: X-PAYMENT)
-    x_payment = payment_sig or x_payment
     if not x_payment:
-        raise HTTPException(
-            status_code=402,
-            detail={
-                "error": "Payment required",
-                "x402": {
-                    "version": "1.0",
-                    "amount": str(required_amount),
-                    "currency": "USDC",
-                    "network": "base",
-                    "description": f"Golden Codex enrichment: {tier['name']}",
-                    "facilitator": "https://x402.org/facilitator",
-                },
-            },
-        )
+        raise HTTPException(status_code=402, detail=_X402_BODIES[body.tier])
 
     if not body.image_url:
         raise HTTPException(status_code=400, detail="image_url is required")
@@ -257,10 +311,13 @@ async def enrich_image(
     await db.collection("enrichment_jobs").document(job_id).set(job_doc)
 
     # Dispatch to pipeline agents asynchronously (fire-and-forget)
-    background_tasks.add_task(
-        _run_enrichment_pipeline, job_id, body.image_url, body.tier, tier["steps"],
-        body.metadata, body.callback_url, db,
-    )
+    if ENRICH_TASKS_QUEUE:
+        await _enqueue_pipeline(job_id)
+    else:
+        background_tasks.add_task(
+            _run_enrichment_pipeline, job_id, body.image_url, body.tier, tier["steps"],
+            body.metadata, body.callback_url, db, request.app.state.http,
+        )
 
     return {
         "job_id": job_id,
@@ -280,7 +337,15 @@ async def enrich_image(
 
 @router.get("/{job_id}")
 async def get_enrichment_status(job_id: str, request: Request):
-    """Poll enrichment job status. Returns results when complete."""
+    """Poll enrichment job status. Returns results when complete.
+
+    Completed/failed jobs never change again, so their encoded response
+    is kept in-process to absorb clients that keep polling after the end.
+    """
+    cached = _terminal_cache.get(job_id)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     db = request.state.db
     doc = await db.collection("enrichment_jobs").document(job_id).get()
 
@@ -301,69 +366,112 @@ async def get_enrichment_status(job_id: str, request: Request):
         response["completed_at"] = job.get("completed_at")
     elif job["status"] == "failed":
         response["error"] = job.get("error")
+    else:
+        return response
 
-    return response
+    content = orjson.dumps(response)
+    _terminal_cache[job_id] = content
+    return Response(content=content, media_type="application/json")
 
 
 @router.post("/batch")
 async def batch_enrich(
     body: BatchEnrichRequest,
     request: Request,
-    x_payment: Optional[str] = Header(None, alias="X-PAYMENT"),
-    payment_sig: Optional[str] = Header(None, alias="PAYMENT-SIGNATURE"),
+    background_tasks: BackgroundTasks,
+    x_payment: Optional[str] = Depends(_x402_payment_header),
 ):
     """Submit a batch of images for enrichment (10+ images, discounted rate)."""
-    x_payment = payment_sig or x_payment
     if len(body.images) < 10:
         raise HTTPException(
             status_code=400,
             detail="Batch enrichment requires minimum 10 images. Use /v1/enrich for singles.",
         )
 
-    tier = ENRICHMENT_TIERS.get(body.tier)
-    if not tier:
-        raise HTTPException(status_code=400, detail=f"Invalid tier: {body.tier}")
+    tier = _lookup_tier(body.tier)
 
     # Batch pricing
     per_image = tier.get("price_usdc", 3.00)
     if body.tier != "batch_full":
         per_image = tier["price_usdc"]  # Use tier price for non-batch tiers
     total_cost = per_image * len(body.images)
+    payment_required = {
+        "error": "Payment required",
+        "x402": {
+            "amount": str(total_cost),
+            "currency": "USDC",
+            "network": "base",
+            "description": f"Batch enrichment: {len(body.images)} images x ${per_image}",
+        },
+    }
 
     if not x_payment:
+        raise HTTPException(status_code=402, detail=payment_required)
+
+    # The batch runs paid steps (Arweave storage, minting) for every image,
+    # so settle the full amount before any job is created
+    payment_result = await verify_x402_payment(x_payment, total_cost)
+    if not payment_result.valid:
         raise HTTPException(
             status_code=402,
-            detail={
-                "error": "Payment required",
-                "x402": {
-                    "amount": str(total_cost),
-                    "currency": "USDC",
-                    "network": "base",
-                    "description": f"Batch enrichment: {len(body.images)} images x ${per_image}",
-                },
-            },
+            detail={**payment_required, "message": f"Payment verification failed: {payment_result.error}"},
         )
 
     db = request.state.db
     batch_id = str(uuid.uuid4())
     now = datetime.now(timezone.utc).isoformat()
 
+    jobs_ref = db.collection("enrichment_jobs")
     job_ids = []
-    for img in body.images:
-        job_id = str(uuid.uuid4())
-        job_doc = {
-            "job_id": job_id,
-            "batch_id": batch_id,
-            "image_url": img.get("image_url"),
-            "tier": body.tier,
-            "steps": tier["steps"],
-            "status": "queued",
-            "input_metadata": img.get("metadata"),
-            "created_at": now,
-            "results": {},
-        }
-        await db.collection("enrichment_jobs").document(job_id).set(job_doc)
-        job_ids.append(job_id)
+    dispatch = []
+    # One getrandom() draw for the whole batch, sliced into v4 UUIDs
+    raw = os.urandom(16 * len(body.images))
+    new_ids = (str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, len(raw), 16))
+    images = iter(body.images)
+    first = True
+    while True:
+        # The first commit also carries the batch summary doc
+        room = FIRESTORE_BATCH_LIMIT - 1 if first else FIRESTORE_BATCH_LIMIT
+        chunk = list(islice(images, room))
+        if not chunk:
+            break
+        batch = db.batch()
+        if first:
+            # Running counters, bumped by the pipeline as each job terminates
+            batch.set(db.collection("batch_summaries").document(batch_id), {
+                "batch_id": batch_id,
+                "tier": body.tier,
+                "total": len(body.images),
+                "completed": 0,
+                "failed": 0,
+                "created_at": now,
+            })
+            first = False
+        for img in chunk:
+            job_id = next(new_ids)
+            batch.set(jobs_ref.document(job_id), {
+                "job_id": job_id,
+                "batch_id": batch_id,
+                "image_url": img.get("image_url"),
+                "tier": body.tier,
+                "steps": tier["steps"],
+                "status": "queued",
+                "input_metadata": img.get("metadata"),
+                "created_at": now,
+                "results": {},
+            })
+            job_ids.append(job_id)
+            dispatch.append((job_id, img.get("image_url"), img.get("metadata")))
+        await batch.commit()
+
+    # Paid jobs must reach the durable queue before we answer; only the
+    # in-process fallback runs after the response
+    if ENRICH_TASKS_QUEUE:
+        await _enqueue_batch(dispatch, batch_id, db)
+    else:
+        background_tasks.add_task(
+            _run_batch, dispatch, body.tier, tier["steps"], batch_id, db, request.app.state.http,
+        )
 
     return {
         "batch_id": batch_id,
@@ -378,38 +486,170 @@ async def batch_enrich(
 
 
 @router.get("/batch/{batch_id}")
-async def get_batch_status(batch_id: str, request: Request):
-    """Get status of all jobs in a batch."""
-    db = request.state.db
+async def get_batch_status(
+    batch_id: str,
+    request: Request,
+    include_jobs: bool = Query(default=True, description="Include a page of per-job statuses"),
+    start_after: Optional[str] = Query(default=None, description="Job ID cursor from the previous page"),
+):
+    """Get status of a batch from its summary counters, plus a page of jobs.
 
-    # Query all jobs with this batch_id
-    query = db.collection("enrichment_jobs").where("batch_id", "==", batch_id)
+    Batches created before summaries existed are counted with count()
+    aggregations over their jobs instead.
+    """
+    db = request.state.db
 
-    jobs = []
-    completed = 0
-    failed = 0
-    async for doc in query.stream():
-        job = doc.to_dict()
-        jobs.append({
-            "job_id": job["job_id"],
-            "status": job["status"],
-            "image_url": job.get("image_url"),
-        })
-        if job["status"] == "completed":
-            completed += 1
-        elif job["status"] == "failed":
-            failed += 1
+    summary_doc = await db.collection("batch_summaries").document(batch_id).get()
+    if summary_doc.exists:
+        summary = summary_doc.to_dict()
+        total = summary["total"]
+        completed = summary.get("completed", 0)
+        failed = summary.get("failed", 0)
+    else:
+        total, completed, failed = await _count_batch_jobs(db, batch_id)
+        if not total:
+            raise HTTPException(status_code=404, detail="Batch not found")
 
-    total = len(jobs)
-    return {
+    response = {
         "batch_id": batch_id,
         "total": total,
         "completed": completed,
         "failed": failed,
         "in_progress": total - completed - failed,
-        "jobs": jobs,
     }
 
+    if include_jobs:
+        jobs_ref = db.collection("enrichment_jobs")
+        query = (
+            jobs_ref.where("batch_id", "==", batch_id)
+            .order_by(firestore.FieldPath.document_id())
+            .limit(BATCH_JOBS_PAGE_SIZE)
+        )
+        if start_after:
+            # Document-ID cursor: no read of the cursor doc, and unknown IDs just page on
+            query = query.start_after({"__name__": jobs_ref.document(start_after)})
+
+        jobs = []
+        async for doc in query.stream():
+            job = doc.to_dict()
+            jobs.append({
+                "job_id": job["job_id"],
+                "status": job["status"],
+                "image_url": job.get("image_url"),
+            })
+        response["jobs"] = jobs
+        response["next_cursor"] = jobs[-1]["job_id"] if len(jobs) == BATCH_JOBS_PAGE_SIZE else None
+
+    return response
+
+
+async def _count_batch_jobs(db, batch_id: str) -> tuple[int, int, int]:
+    """Return ``(total, completed, failed)`` job counts for a batch without a summary doc."""
+    query = db.collection("enrichment_jobs").where("batch_id", "==", batch_id)
+    results = await asyncio.gather(
+        query.count().get(),
+        query.where("status", "==", "completed").count().get(),
+        query.where("status", "==", "failed").count().get(),
+    )
+    return tuple(result[0][0].value for result in results)
+
+
+# ── Durable dispatch (Cloud Tasks → worker) ─────────────────────────────────
+
+_tasks_client = None
+
+
+def _get_tasks_client():
+    """Lazy-initialise the Cloud Tasks client (reused across requests)."""
+    global _tasks_client
+    if _tasks_client is None:
+        from google.cloud import tasks_v2
+        _tasks_client = tasks_v2.CloudTasksAsyncClient()
+    return _tasks_client
+
+
+async def _enqueue_pipeline(job_id: str):
+    """Publish a Cloud Tasks task that runs the job's pipeline on the worker."""
+    from google.protobuf import duration_pb2
+
+    await _get_tasks_client().create_task(
+        parent=ENRICH_TASKS_QUEUE,
+        task={
+            "http_request": {
+                "http_method": "POST",
+                "url": f"{ENRICH_WORKER_URL}/enrich/worker/{job_id}",
+                "headers": {"X-WORKER-KEY": ENRICH_WORKER_KEY},
+            },
+            "dispatch_deadline": duration_pb2.Duration(seconds=WORKER_DISPATCH_DEADLINE),
+        },
+    )
+    logger.info("Job %s: enqueued on %s", job_id, ENRICH_TASKS_QUEUE)
+
+
+async def _require_worker_key(x_worker_key: str = Header(alias="X-WORKER-KEY", default="")):
+    """Verify the caller is our Cloud Tasks queue."""
+    if not ENRICH_WORKER_KEY or not hmac.compare_digest(
+        (x_worker_key or "").encode(), ENRICH_WORKER_KEY.encode(),
+    ):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+async def _claim_job(db, job_ref) -> tuple[Optional[dict], bool]:
+    """Transactionally move a job to "in_progress" under a JOB_LEASE_SECONDS lease.
+
+    Returns ``(job, claimed)``; ``job`` is None if the doc doesn't exist.
+    Terminal jobs and jobs under another worker's unexpired lease are not
+    claimed. An expired lease (the worker crashed) can be taken over.
+    """
+    @firestore.async_transactional
+    async def claim_in_txn(txn, ref):
+        doc = await ref.get(transaction=txn)
+        if not doc.exists:
+            return None, False
+        job = doc.to_dict()
+        now = datetime.now(timezone.utc)
+        if job["status"] in ("completed", "failed"):
+            return job, False
+        lease_expires_at = job.get("lease_expires_at")
+        if job["status"] == "in_progress" and lease_expires_at and lease_expires_at > now:
+            return job, False
+        txn.update(ref, {
+            "status": "in_progress",
+            "lease_expires_at": now + timedelta(seconds=JOB_LEASE_SECONDS),
+        })
+        return job, True
+
+    return await claim_in_txn(db.transaction(), job_ref)
+
+
+@router.post("/worker/{job_id}", include_in_schema=False, dependencies=[Depends(_require_worker_key)])
+async def run_enrichment_worker(job_id: str, request: Request):
+    """Cloud Tasks target: run one job's pipeline to completion.
+
+    Always answers 2xx once the pipeline has run (failures are recorded on
+    the job), so Cloud Tasks only redelivers on crashes or timeouts.
+    The job is claimed first: redeliveries of terminal jobs are acknowledged
+    as no-ops, while a job under another worker's live lease gets a 409 so
+    Cloud Tasks keeps the task and retries -- if that worker crashed, a later
+    attempt takes the job over once the lease expires.
+    """
+    db = request.state.db
+    job, claimed = await _claim_job(db, db.collection("enrichment_jobs").document(job_id))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Enrichment job not found")
+
+    if not claimed:
+        if job["status"] in ("completed", "failed"):
+            return {"job_id": job_id, "status": job["status"]}
+        raise HTTPException(status_code=409, detail="Enrichment job is already running")
+
+    await _run_enrichment_pipeline(
+        job_id, job["image_url"], job["tier"], job["steps"],
+        job.get("input_metadata"), job.get("callback_url"), db,
+        request.app.state.http, job.get("batch_id"), claimed=True,
+    )
+    return {"job_id": job_id, "status": "done"}
+
 
 # ── Pipeline dispatch (background) ──────────────────────────────────────────
 
@@ -422,6 +662,116 @@ STEP_AGENTS = {
     "nft_minting": MINTRA_AGENT_URL,
 }
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Step retry policy (Cloud Run cold starts surface as 429/503)
+STEP_MAX_ATTEMPTS = 4
+STEP_RETRY_BACKOFF = [0.5, 2.0, 8.0]  # seconds before attempts 2-4 (plus jitter)
+STEP_RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+STEP_MAX_RESPONSE_BYTES = 16 * 1024 * 1024
+
+
+class StepResponseTooLarge(Exception):
+    """Agent returned a step result larger than STEP_MAX_RESPONSE_BYTES."""
+
+# Step dependency graph — a step runs once every dependency that is part of
+# the job's tier has completed; steps with no outstanding deps run concurrently.
+STEP_DEPS = {
+    "nova_oracle": [],
+    "c2pa_signing": ["nova_oracle"],
+    "hash_registration": ["nova_oracle"],
+    "arweave_storage": ["c2pa_signing"],
+    "nft_minting": ["arweave_storage", "hash_registration"],
+}
+
+
+def _plan_rounds(steps: list[str]) -> list[list[tuple[str, str]]]:
+    """Resolve a tier's steps into rounds of ``(step, agent_url)`` that can run concurrently."""
+    for step in steps:
+        if step not in STEP_AGENTS or step not in STEP_DEPS:
+            raise RuntimeError(f"Enrichment step '{step}' has no agent or dependency entry")
+
+    rounds = []
+    pending = list(steps)
+    while pending:
+        ready = [step for step in pending if not any(dep in pending for dep in STEP_DEPS[step])]
+        if not ready:
+            raise RuntimeError(f"Cyclic enrichment step dependencies: {pending}")
+        rounds.append([(step, STEP_AGENTS[step]) for step in ready])
+        pending = [step for step in pending if step not in ready]
+    return rounds
+
+
+# Execution plan per tier, resolved (and validated) once at import
+TIER_PLANS = {name: _plan_rounds(cfg["steps"]) for name, cfg in ENRICHMENT_TIERS.items()}
+
+
+async def warm_agent_connections(client: httpx.AsyncClient):
+    """Ping every agent host once so DNS, TCP/TLS and Cloud Run are warm.
+
+    Any response (even 404) leaves a kept-alive connection in the pool.
+    """
+    await asyncio.gather(
+        *[client.get(f"{url}/health", timeout=5.0) for url in set(STEP_AGENTS.values())],
+        return_exceptions=True,
+    )
+
+
+async def agent_keepalive_loop(client: httpx.AsyncClient):
+    """Re-warm agent connections every AGENT_KEEPALIVE_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(AGENT_KEEPALIVE_INTERVAL)
+        await warm_agent_connections(client)
+
+
+async def _dispatch(
+    client: httpx.AsyncClient,
+    agent_url: str,
+    job_id: str,
+    step: str,
+    body: bytes,
+) -> tuple[str, dict | Exception]:
+    """POST one step's pre-encoded payload to its agent. Returns ``(step, result_or_exc)``.
+
+    Transient failures (connection errors, 408/429/5xx) are retried with
+    jittered exponential backoff; other 4xx fail immediately. Every attempt
+    carries ``Idempotency-Key: {job_id}:{step}`` so agents can dedupe
+    retried mint/storage calls instead of paying twice. The response
+    is streamed into a single buffer and capped at STEP_MAX_RESPONSE_BYTES
+    so a runaway agent can't balloon the worker's heap.
+    """
+    headers = {**_JSON_HEADERS, "Idempotency-Key": f"{job_id}:{step}"}
+    for attempt in range(STEP_MAX_ATTEMPTS):
+        try:
+            async with client.stream(
+                "POST", f"{agent_url}/enrich_step", content=body, headers=headers,
+            ) as resp:
+                resp.raise_for_status()
+                buf = bytearray()
+                async for chunk in resp.aiter_bytes():
+                    buf += chunk
+                    if len(buf) > STEP_MAX_RESPONSE_BYTES:
+                        return step, StepResponseTooLarge(
+                            f"Step '{step}' response exceeded {STEP_MAX_RESPONSE_BYTES} bytes"
+                        )
+            return step, orjson.loads(buf)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code not in STEP_RETRY_STATUSES:
+                return step, exc
+            last_exc = exc
+        except httpx.RequestError as exc:
+            last_exc = exc
+
+        if attempt < STEP_MAX_ATTEMPTS - 1:
+            delay = STEP_RETRY_BACKOFF[attempt]
+            logger.warning(
+                "Job %s: step '%s' attempt %d/%d failed (%s), retrying",
+                job_id, step, attempt + 1, STEP_MAX_ATTEMPTS, last_exc,
+            )
+            await asyncio.sleep(delay + random.uniform(0, delay))
+
+    return step, last_exc
+
 
 async def _run_enrichment_pipeline(
     job_id: str,
@@ -431,98 +781,179 @@ async def _run_enrichment_pipeline(
     input_metadata: dict | None,
     callback_url: str | None,
     db,
+    client: httpx.AsyncClient,
+    batch_id: str | None = None,
+    claimed: bool = False,
 ):
-    """Execute the enrichment pipeline steps sequentially.
-
-    Each step calls its Cloud Run agent, collects results, updates Firestore,
-    then proceeds to the next step. On failure, marks the job failed and stops.
+    """Execute the enrichment pipeline steps in dependency order.
+
+    Each round of the tier's precomputed plan (``TIER_PLANS``) is
+    dispatched concurrently, then its results are recorded. Step outputs are
+    persisted under ``enrichment_jobs/{job_id}/step_results/{step}`` and
+    later steps receive document paths rather than the results themselves,
+    so agents fetch only what they need. On failure, marks
+    the job failed and stops. ``client`` is the app-wide pooled client
+    created in the lifespan handler. Jobs with a ``batch_id`` also bump
+    that batch's summary counters when they terminate. ``claimed`` jobs
+    were already moved to in_progress by the worker's ``_claim_job``.
     """
     results = {}
+    step_results_ref = db.collection("enrichment_jobs").document(job_id).collection("step_results")
+    started_at = datetime.now(timezone.utc).isoformat()
     try:
-        await db.collection("enrichment_jobs").document(job_id).update(
-            {"status": "in_progress", "started_at": datetime.now(timezone.utc).isoformat()}
-        )
+        if not claimed:
+            await db.collection("enrichment_jobs").document(job_id).update({"status": "in_progress"})
 
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            for step in steps:
-                agent_url = STEP_AGENTS.get(step)
-                if not agent_url:
-                    logger.warning("No agent mapped for step %s, skipping", step)
-                    continue
+        # Fields shared by every step, encoded once (trailing "}" dropped so
+        # the per-step fields can be spliced on)
+        common_prefix = orjson.dumps({
+            "job_id": job_id,
+            "image_url": image_url,
+            "tier": tier,
+            "input_metadata": input_metadata,
+        })[:-1]
 
+        for ready in TIER_PLANS[tier]:
+            for step, agent_url in ready:
                 logger.info("Job %s: dispatching step '%s' to %s", job_id, step, agent_url)
 
-                payload = {
-                    "job_id": job_id,
-                    "image_url": image_url,
-                    "step": step,
-                    "tier": tier,
-                    "input_metadata": input_metadata,
-                    "previous_results": results,
-                }
-
-                try:
-                    resp = await client.post(
-                        f"{agent_url}/enrich_step",
-                        json=payload,
-                        headers={"Content-Type": "application/json"},
-                    )
-                    resp.raise_for_status()
-                    step_result = resp.json()
-                    results[step] = step_result
+            refs_suffix = b',"previous_results_refs":' + orjson.dumps(
+                {s: f"enrichment_jobs/{job_id}/step_results/{s}" for s in results}
+            ) + b"}"
+            outcomes = await asyncio.gather(*[
+                _dispatch(
+                    client, agent_url, job_id, step,
+                    common_prefix + b',"step":' + orjson.dumps(step) + refs_suffix,
+                )
+                for step, agent_url in ready
+            ])
+
+            error_msg = None
+            round_batch = db.batch()
+            for step, outcome in outcomes:
+                if isinstance(outcome, httpx.HTTPStatusError):
+                    error_msg = error_msg or f"Step '{step}' failed: HTTP {outcome.response.status_code}"
+                elif isinstance(outcome, httpx.RequestError):
+                    error_msg = error_msg or f"Step '{step}' unreachable: {outcome}"
+                elif isinstance(outcome, StepResponseTooLarge):
+                    error_msg = error_msg or str(outcome)
+                else:
+                    results[step] = outcome
+                    round_batch.set(step_results_ref.document(step), outcome)
                     logger.info("Job %s: step '%s' completed", job_id, step)
 
-                except httpx.HTTPStatusError as exc:
-                    error_msg = f"Step '{step}' failed: HTTP {exc.response.status_code}"
-                    logger.error("Job %s: %s", job_id, error_msg)
-                    await _fail_job(db, job_id, error_msg, results)
-                    return
+            if error_msg:
+                logger.error("Job %s: %s", job_id, error_msg)
+                await _fail_job(db, job_id, error_msg, results, batch_id)
+                return
 
-                except httpx.RequestError as exc:
-                    error_msg = f"Step '{step}' unreachable: {exc}"
-                    logger.error("Job %s: %s", job_id, error_msg)
-                    await _fail_job(db, job_id, error_msg, results)
-                    return
+            await round_batch.commit()
 
         # All steps completed
         now = datetime.now(timezone.utc).isoformat()
-        await db.collection("enrichment_jobs").document(job_id).update({
+        await _write_terminal(db, job_id, {
             "status": "completed",
             "results": results,
+            "started_at": started_at,
             "completed_at": now,
-        })
+        }, batch_id)
         logger.info("Job %s: pipeline completed (%d steps)", job_id, len(steps))
 
-        # Send webhook callback if provided
+        # Send webhook callback if provided (off the critical path)
         if callback_url:
-            await _send_callback(callback_url, job_id, "completed", results)
+            body = orjson.dumps({"job_id": job_id, "status": "completed", "results": results})
+            task = asyncio.create_task(_send_callback(client, callback_url, job_id, body))
+            _callback_tasks.add(task)
+            task.add_done_callback(_callback_tasks.discard)
 
     except Exception as exc:
         logger.exception("Job %s: unexpected pipeline error", job_id)
-        await _fail_job(db, job_id, str(exc), results)
+        await _fail_job(db, job_id, str(exc), results, batch_id)
+
+
+async def _write_terminal(db, job_id: str, update: dict, batch_id: str | None):
+    """Write a job's terminal state, bumping its batch counter atomically."""
+    job_ref = db.collection("enrichment_jobs").document(job_id)
+    if not batch_id:
+        await job_ref.update(update)
+        return
+
+    batch = db.batch()
+    batch.update(job_ref, update)
+    batch.update(
+        db.collection("batch_summaries").document(batch_id),
+        {update["status"]: firestore.Increment(1)},
+    )
+    await batch.commit()
 
 
-async def _fail_job(db, job_id: str, error: str, partial_results: dict):
+_BATCH_SEM = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+
+async def _run_batch(
+    jobs: list[tuple[str, str, dict | None]],
+    tier: str,
+    steps: list[str],
+    batch_id: str,
+    db,
+    client: httpx.AsyncClient,
+):
+    """Run every job in a batch in-process, at most BATCH_MAX_CONCURRENCY at a time.
+
+    The in-process fallback for when ENRICH_TASKS_QUEUE is unset. The
+    semaphore is process-wide, so concurrent batches share one pool.
+    """
+    async def run(job_id: str, image_url: str, metadata: dict | None):
+        async with _BATCH_SEM:
+            await _run_enrichment_pipeline(
+                job_id, image_url, tier, steps, metadata, None, db, client, batch_id,
+            )
+
+    outcomes = await asyncio.gather(*[run(*job) for job in jobs], return_exceptions=True)
+    for (job_id, _, _), outcome in zip(jobs, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error("Batch %s: could not dispatch job %s: %s", batch_id, job_id, outcome)
+
+
+async def _enqueue_batch(jobs: list[tuple[str, str, dict | None]], batch_id: str, db):
+    """Publish a Cloud Tasks task per batch job, at most BATCH_MAX_CONCURRENCY at a time.
+
+    A job that can't be enqueued is marked failed, which also bumps the
+    batch's failed counter so its in_progress count still drains.
+    """
+    async def enqueue(job_id: str):
+        async with _BATCH_SEM:
+            await _enqueue_pipeline(job_id)
+
+    outcomes = await asyncio.gather(*[enqueue(job_id) for job_id, _, _ in jobs], return_exceptions=True)
+    for (job_id, _, _), outcome in zip(jobs, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error("Batch %s: could not enqueue job %s: %s", batch_id, job_id, outcome)
+            await _fail_job(db, job_id, f"Could not enqueue job: {outcome}", {}, batch_id)
+
+
+async def _fail_job(
+    db, job_id: str, error: str, partial_results: dict, batch_id: str | None = None,
+):
     """Mark a job as failed in Firestore."""
     try:
-        await db.collection("enrichment_jobs").document(job_id).update({
+        await _write_terminal(db, job_id, {
             "status": "failed",
             "error": error,
             "results": partial_results,
             "failed_at": datetime.now(timezone.utc).isoformat(),
-        })
+        }, batch_id)
     except Exception:
         logger.exception("Job %s: could not update failure status", job_id)
 
 
-async def _send_callback(callback_url: str, job_id: str, status: str, results: dict):
-    """POST completion notification to the caller's webhook."""
+# Strong refs so in-flight fire-and-forget callbacks aren't garbage-collected
+_callback_tasks: set[asyncio.Task] = set()
+
+
+async def _send_callback(client: httpx.AsyncClient, callback_url: str, job_id: str, body: bytes):
+    """POST a pre-encoded completion notification to the caller's webhook."""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            await client.post(callback_url, json={
-                "job_id": job_id,
-                "status": status,
-                "results": results,
-            })
+        await client.post(callback_url, content=body, headers=_JSON_HEADERS, timeout=30.0)
     except Exception:
         logger.warning("Job %s: callback to %s failed", job_id, callback_url)
@@ -13,19 +13,25 @@ Every commercial order includes an auto-generated AB 2013 compliance manifest.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import uuid
 from datetime import datetime, timezone
+from decimal import Decimal
 from typing import Optional
 
+import orjson
 import stripe
+from cachetools import TTLCache
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, EmailStr, Field
 
 from auth import generate_signed_url
 from compliance import generate_ab2013_manifest
 from pricing import PRICING_TIERS, calculate_price
+from routes.catalog import DATASETS
 
 logger = logging.getLogger("data-portal.orders")
 
@@ -33,6 +39,23 @@ router = APIRouter(prefix="/orders", tags=["orders"])
 
 DATA_BUCKET = os.environ.get("DATA_BUCKET", "alexandria-download-1m")
 
+# Let stripe-python retry network errors and 409 idempotency conflicts
+# (with backoff) instead of surfacing them as 502s
+stripe.max_network_retries = 2
+SIGN_CONCURRENCY = 32  # Max in-flight signer calls per downloads request
+
+# DATASETS is static, so the 404 listing is rendered once
+_DATASET_IDS = tuple(DATASETS)
+_DATASET_IDS_TEXT = str(list(_DATASET_IDS))
+
+# Orders in a terminal status never change, so they're cached in-process;
+# unknown IDs are remembered briefly to short-circuit bot scans.
+TERMINAL_ORDER_STATUSES = ("fulfilled", "completed", "cancelled")
+_ORDER_CACHE: TTLCache = TTLCache(maxsize=2048, ttl=300)
+_MISSING_ORDER_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=60)
+# Manifests are written once with their order and never change
+_MANIFEST_CACHE: TTLCache = TTLCache(maxsize=2048, ttl=300)
+
 
 # ---------------------------------------------------------------------------
 # Request / response models
@@ -62,6 +85,97 @@ class CreateOrderRequest(BaseModel):
     organization: Optional[str] = Field(default=None)
 
 
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+async def _write_order(db, order_doc: dict, manifest_json: dict):
+    """Write an order and its compliance manifest in one batched commit.
+
+    The manifest lives in ``data_portal_manifests/{order_id}`` so the order
+    doc itself stays small. Both are create-only: a replayed write fails
+    instead of silently overwriting an order that has moved on.
+    """
+    order_id = order_doc["order_id"]
+    batch = db.batch()
+    batch.create(db.collection("data_portal_orders").document(order_id), order_doc)
+    batch.create(db.collection("data_portal_manifests").document(order_id), {
+        "order_id": order_id,
+        "json": manifest_json,
+    })
+    await batch.commit()
+
+
+async def _load_order(db, order_id: str) -> dict:
+    """Load an order doc, or raise 404.
+
+    Only terminal orders are cached -- pending ones must always reflect
+    payment transitions. The compliance manifest is not read here; see
+    ``_load_manifest``.
+    """
+    order = _ORDER_CACHE.get(order_id)
+    if order is not None:
+        return order
+    if order_id in _MISSING_ORDER_CACHE:
+        raise HTTPException(status_code=404, detail="Order not found")
+
+    doc = await db.collection("data_portal_orders").document(order_id).get()
+    if not doc.exists:
+        _MISSING_ORDER_CACHE[order_id] = True
+        raise HTTPException(status_code=404, detail="Order not found")
+
+    order = doc.to_dict()
+    if order.get("status") in TERMINAL_ORDER_STATUSES:
+        _ORDER_CACHE[order_id] = order
+    return order
+
+
+async def _load_manifest(db, order_id: str, order: dict) -> Optional[dict]:
+    """Return an order's compliance manifest.
+
+    Older orders carry it inline; newer ones keep it in
+    ``data_portal_manifests/{order_id}``, read once and then cached.
+    """
+    if order.get("compliance_manifest"):
+        return order["compliance_manifest"]
+    if order_id in _MANIFEST_CACHE:
+        return _MANIFEST_CACHE[order_id]
+
+    doc = await db.collection("data_portal_manifests").document(order_id).get()
+    manifest = doc.to_dict().get("json") if doc.exists else None
+    _MANIFEST_CACHE[order_id] = manifest
+    return manifest
+
+
+async def _sign_url(sem: asyncio.Semaphore, bucket: str, path: str) -> str:
+    """Sign one download URL off the event loop; public URL on failure."""
+    async with sem:
+        try:
+            return await asyncio.to_thread(generate_signed_url, bucket, path, expiration_hours=24)
+        except Exception:
+            return f"https://storage.googleapis.com/{bucket}/{path}"
+
+
+async def _yield_downloads(bucket: str, prefix: str, indices: range):
+    """Yield NDJSON download records, signing one SIGN_CONCURRENCY window at a time.
+
+    Records go out in index order while the next window is still unsigned,
+    so memory stays bounded by the window rather than the page size.
+    """
+    sem = asyncio.Semaphore(SIGN_CONCURRENCY)
+    for start in range(0, len(indices), SIGN_CONCURRENCY):
+        window = indices[start:start + SIGN_CONCURRENCY]
+        image_urls, meta_urls = await asyncio.gather(
+            asyncio.gather(*[_sign_url(sem, bucket, f"{prefix}{i:06d}.jpg") for i in window]),
+            asyncio.gather(*[_sign_url(sem, bucket, f"{prefix}{i:06d}_meta.json") for i in window]),
+        )
+        yield b"".join(
+            orjson.dumps({"index": i, "image_url": image_url, "metadata_url": meta_url}) + b"\n"
+            for i, image_url, meta_url in zip(window, image_urls, meta_urls)
+        )
+
+
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
@@ -78,13 +192,11 @@ async def create_order(body: CreateOrderRequest, request: Request):
     db = request.state.db
 
     # Validate dataset exists
-    from routes.catalog import DATASETS
-
     if body.dataset_id not in DATASETS:
         raise HTTPException(
             status_code=404,
             detail=f"Dataset '{body.dataset_id}' not found. "
-            f"Available: {list(DATASETS.keys())}",
+            f"Available: {_DATASET_IDS_TEXT}",
         )
 
     # Determine pricing tier
@@ -140,20 +252,15 @@ async def create_order(body: CreateOrderRequest, request: Request):
         "created_at": now,
     }
 
-    # Generate AB 2013 compliance manifest for commercial orders
-    if price_info["total"] > 0:
-        manifest = generate_ab2013_manifest(order_doc, body.dataset_id)
-        order_doc["compliance_manifest"] = manifest["json"]
-    else:
-        # Free tier -- still attach a lightweight manifest
-        manifest = generate_ab2013_manifest(order_doc, body.dataset_id)
-        order_doc["compliance_manifest"] = manifest["json"]
+    # Generate AB 2013 compliance manifest -- every order gets one, free or paid
+    # (stored alongside the order in data_portal_manifests, see _write_order)
+    manifest = generate_ab2013_manifest(order_doc, body.dataset_id)
 
     # ---- Free tier: auto-fulfill ----
     if price_info["total"] == 0:
         order_doc["status"] = "fulfilled"
         order_doc["fulfilled_at"] = now
-        await db.collection("data_portal_orders").document(order_id).set(order_doc)
+        await _write_order(db, order_doc, manifest["json"])
 
         return {
             "order_id": order_id,
@@ -172,7 +279,7 @@ async def create_order(body: CreateOrderRequest, request: Request):
         stripe_key = request.state.stripe_secret_key
         if not stripe_key:
             # Store order as pending; provide manual payment info
-            await db.collection("data_portal_orders").document(order_id).set(order_doc)
+            await _write_order(db, order_doc, manifest["json"])
             return {
                 "order_id": order_id,
                 "status": "pending_payment",
@@ -183,11 +290,16 @@ async def create_order(body: CreateOrderRequest, request: Request):
                 "message": "Stripe is not yet configured. Contact data@iaeternum.ai to complete your purchase.",
             }
 
-        stripe.api_key = stripe_key
-
         try:
-            price_cents = int(price_info["total"] * 100)
-            session = stripe.checkout.Session.create(
+            # Decimal avoids float truncation (e.g. 0.29 * 100 -> 28)
+            price_cents = int((Decimal(str(price_info["total"])) * 100).to_integral_value())
+            # Blocking Stripe RTT runs in a worker thread. The key is passed per
+            # call (no global mutation) and the order-derived idempotency key
+            # makes the library's retries safe.
+            session = await asyncio.to_thread(
+                stripe.checkout.Session.create,
+                api_key=stripe_key,
+                idempotency_key=f"order-{order_id}",
                 payment_method_types=["card"],
                 line_items=[{
                     "price_data": {
@@ -212,7 +324,7 @@ async def create_order(body: CreateOrderRequest, request: Request):
             logger.error("Stripe session creation failed: %s", e)
             raise HTTPException(status_code=502, detail=f"Stripe error: {e}")
 
-        await db.collection("data_portal_orders").document(order_id).set(order_doc)
+        await _write_order(db, order_doc, manifest["json"])
 
         return {
             "order_id": order_id,
@@ -229,7 +341,7 @@ async def create_order(body: CreateOrderRequest, request: Request):
     if body.payment_method == "x402":
         wallet = request.state.base_wallet_address
         order_doc["status"] = "awaiting_x402"
-        await db.collection("data_portal_orders").document(order_id).set(order_doc)
+        await _write_order(db, order_doc, manifest["json"])
 
         return {
             "order_id": order_id,
@@ -263,13 +375,7 @@ async def get_order(order_id: str, request: Request):
     When status is 'fulfilled', includes download links.
     """
     db = request.state.db
-    doc_ref = db.collection("data_portal_orders").document(order_id)
-    doc = await doc_ref.get()
-
-    if not doc.exists:
-        raise HTTPException(status_code=404, detail="Order not found")
-
-    order = doc.to_dict()
+    order = await _load_order(db, order_id)
 
     response = {
         "order_id": order.get("order_id"),
@@ -287,8 +393,9 @@ async def get_order(order_id: str, request: Request):
     if order.get("status") in ("fulfilled", "completed"):
         response["downloads_url"] = f"/orders/{order_id}/downloads"
 
-    if order.get("compliance_manifest"):
-        response["compliance_manifest"] = order["compliance_manifest"]
+    manifest = await _load_manifest(db, order_id, order)
+    if manifest:
+        response["compliance_manifest"] = manifest
 
     return response
 
@@ -303,15 +410,10 @@ async def get_downloads(
     """Get signed download URLs for a fulfilled order.
 
     URLs are valid for 24 hours.  Use offset/limit for pagination on large orders.
+    Send ``Accept: application/x-ndjson`` to stream one record per line
+    instead of a single JSON document.
     """
-    db = request.state.db
-    doc_ref = db.collection("data_portal_orders").document(order_id)
-    doc = await doc_ref.get()
-
-    if not doc.exists:
-        raise HTTPException(status_code=404, detail="Order not found")
-
-    order = doc.to_dict()
+    order = await _load_order(request.state.db, order_id)
 
     if order.get("status") not in ("fulfilled", "completed"):
         raise HTTPException(
@@ -325,29 +427,27 @@ async def get_downloads(
     bucket = request.state.data_bucket
 
     # Determine GCS prefix from dataset
-    from routes.catalog import DATASETS
-
     ds = DATASETS.get(dataset_id)
     prefix = ds.gcs_prefix if ds else f"{dataset_id}/"
 
-    # Generate signed download URLs (24hr expiry for purchased content)
-    downloads = []
-    end = min(offset + limit, quantity)
-    for i in range(offset, end):
-        blob_path = f"{prefix}{i:06d}.jpg"
-        meta_path = f"{prefix}{i:06d}_meta.json"
-        try:
-            image_url = generate_signed_url(bucket, blob_path, expiration_hours=24)
-            meta_url = generate_signed_url(bucket, meta_path, expiration_hours=24)
-        except Exception:
-            image_url = f"https://storage.googleapis.com/{bucket}/{blob_path}"
-            meta_url = f"https://storage.googleapis.com/{bucket}/{meta_path}"
-
-        downloads.append({
-            "index": i,
-            "image_url": image_url,
-            "metadata_url": meta_url,
-        })
+    # Generate signed download URLs (24hr expiry for purchased content),
+    # signing concurrently in worker threads
+    indices = range(offset, min(offset + limit, quantity))
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _yield_downloads(bucket, prefix, indices),
+            media_type="application/x-ndjson",
+        )
+
+    sem = asyncio.Semaphore(SIGN_CONCURRENCY)
+    image_urls, meta_urls = await asyncio.gather(
+        asyncio.gather(*[_sign_url(sem, bucket, f"{prefix}{i:06d}.jpg") for i in indices]),
+        asyncio.gather(*[_sign_url(sem, bucket, f"{prefix}{i:06d}_meta.json") for i in indices]),
+    )
+    downloads = [
+        {"index": i, "image_url": image_url, "metadata_url": meta_url}
+        for i, image_url, meta_url in zip(indices, image_urls, meta_urls)
+    ]
 
     return {
         "order_id": order_id,
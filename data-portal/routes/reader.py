@@ -12,32 +12,86 @@ Endpoints:
 
 from __future__ import annotations
 
+import asyncio
 import base64
-import gzip
-import json
+import binascii
+import functools
 import logging
 import os
-import subprocess
+import re
+import struct
 import tempfile
-from typing import Optional
-
+import threading
+import zlib
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+import orjson
+from cachetools import TTLCache
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse
+from google.api_core.exceptions import RequestRangeNotSatisfiable
 from google.cloud import storage as gcs
+from google.cloud.exceptions import NotFound
+from requests.adapters import HTTPAdapter
 
 from auth import get_client_fingerprint, rate_limiter, verify_x402_payment, BASE_WALLET_ADDRESS
 
 logger = logging.getLogger("data-portal.reader")
 
-router = APIRouter(prefix="/agent", tags=["reader"])
+router = APIRouter(prefix="/agent", tags=["reader"], default_response_class=ORJSONResponse)
 
 # Bucket containing the _final.png infused images
 ASSETS_BUCKET = os.environ.get("ASSETS_BUCKET", "codex-aeternum-assets")
 IMAGES_PREFIX = "alexandria-aeternum/images"
 
+# Shared GCS client; its HTTP pool is widened for the concurrent downloads
+# reader requests run in worker threads
+GCS_POOL_CONNECTIONS = 32
+GCS_POOL_MAXSIZE = 64
+_gcs_client: gcs.Client | None = None
+_gcs_lock = threading.Lock()
+
+# (field, lowercase needle) pairs surfaced as image_info
+_IMAGE_INFO_FIELDS = tuple(
+    (field, field.lower())
+    for field in ("ImageWidth", "ImageHeight", "FileSize", "FileType", "Megapixels")
+)
+
+# Artifact IDs: GCX-AA-00001 .. GCX-AA-10090
+_ARTIFACT_RE = re.compile(r"^GCX-AA-(\d{5})$")
+MAX_ARTIFACT_NUMBER = 10090
+
+# Ranged read for the PNG fast path — XMP text chunks sit ahead of the pixel data
+PNG_HEAD_BYTES = 256 * 1024
+
 # Rate limit: 5 free reads/day, then $0.05 per read
 FREE_READS_PER_DAY = 5
 READER_PRICE = 0.05  # $0.05 USDC per read after free tier
 
+# Buyer status rarely flips within a minute; cache per client IP
+_buyer_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+# x402 network (read once) and per-network USDC contract / EIP-712 domain
+X402_NETWORK = os.environ.get("X402_NETWORK", "eip155:8453")
+_USDC_ADDRESSES = {
+    "eip155:8453": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
+    "eip155:84532": "0x036CbD53842c5426634e7929541eC2318f3dCF7e",
+}
+_EIP712_DOMAINS = {
+    "eip155:8453": {"name": "USD Coin", "version": "2"},
+    "eip155:84532": {"name": "USDC", "version": "2"},
+}
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_XMP_KEYWORDS = (b"XML:com.adobe.xmp", b"XMP")
+# Element (<gc:CodexPayload>…</gc:CodexPayload>) or attribute (gc:CodexPayload="…") form
+_CODEX_XMP_RE = re.compile(
+    rb'<([\w-]+):(CodexPayload|GoldenCodex)\b[^>]*>([^<]+)</\1:\2>'
+    rb'|\b([\w-]+):(CodexPayload|GoldenCodex)="([^"]+)"'
+)
+
 # Fields to check for Golden Codex payload (priority order)
 CODEX_PAYLOAD_FIELDS = [
     "XMP-gc:CodexPayload",
@@ -46,6 +100,8 @@ CODEX_PAYLOAD_FIELDS = [
     "CodexPayload",
     "GoldenCodex",
 ]
+_CODEX_FIELDS_SET = frozenset(CODEX_PAYLOAD_FIELDS)
+_CODEX_SUBSTRINGS = ("codexpayload", "goldencodex")
 
 
 # ---------------------------------------------------------------------------
@@ -53,49 +109,169 @@ CODEX_PAYLOAD_FIELDS = [
 # ---------------------------------------------------------------------------
 
 
+def _gcs() -> gcs.Client:
+    """Process-wide GCS client (credentials + keep-alive session built once)."""
+    global _gcs_client
+    if _gcs_client is None:
+        with _gcs_lock:
+            if _gcs_client is None:
+                client = gcs.Client()
+                client._http.mount("https://", HTTPAdapter(
+                    pool_connections=GCS_POOL_CONNECTIONS, pool_maxsize=GCS_POOL_MAXSIZE,
+                ))
+                _gcs_client = client
+    return _gcs_client
+
+
+def _download_image(blob_path: str) -> tuple[Optional[dict], Optional[str]]:
+    """Fetch an infused image for decoding. Blocking -- run it in a worker thread.
+
+    Returns ``(metadata, None)`` when the PNG head's XMP chunk could be
+    parsed directly, otherwise ``(None, tmp_path)`` with the whole image
+    written to a temp file for ExifTool. Raises NotFound for a missing blob.
+    """
+    blob = _gcs().bucket(ASSETS_BUCKET).blob(blob_path)
+
+    # Fast path: ranged read of the PNG head, parse the XMP chunk directly.
+    # A missing artifact surfaces here as NotFound -- no separate exists() call.
+    head = blob.download_as_bytes(start=0, end=PNG_HEAD_BYTES - 1)
+    raw_metadata = _fast_png_metadata(head)
+    if raw_metadata is not None:
+        # A short head is the whole object; otherwise rely on the size the
+        # download populated on the blob
+        size = blob.size if len(head) == PNG_HEAD_BYTES else len(head)
+        if size is not None:
+            raw_metadata["System:FileSize"] = _format_file_size(int(size))
+        return raw_metadata, None
+
+    # Slow path: temp file for ExifTool, reusing the head bytes already in
+    # memory and fetching only the remainder (nothing more if the head was
+    # short, i.e. already the whole image)
+    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
+        try:
+            tmp.write(memoryview(head))
+            if len(head) == PNG_HEAD_BYTES and blob.size != PNG_HEAD_BYTES:
+                try:
+                    blob.download_to_file(tmp, start=PNG_HEAD_BYTES)
+                except RequestRangeNotSatisfiable:
+                    pass  # object ends exactly at the head boundary
+        except Exception:
+            os.unlink(tmp.name)
+            raise
+    return None, tmp.name
+
+
+def _format_file_size(size: int) -> str:
+    """Format a byte count the way ExifTool prints FileSize."""
+    if size < 2048:
+        return f"{size} bytes"
+    if size < 10240:
+        return f"{size / 1024:.1f} kB"
+    if size < 2 * 1024 * 1024:
+        return f"{size / 1024:.0f} kB"
+    if size < 10 * 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / (1024 * 1024):.0f} MB"
+
+
 def _decode_codex_payload(encoded: str) -> dict:
-    """Decode Golden Codex payload: base64 → gzip → JSON."""
-    try:
-        decoded_bytes = base64.b64decode(encoded)
-        json_bytes = gzip.decompress(decoded_bytes)
-        return json.loads(json_bytes.decode("utf-8"))
-    except Exception:
-        return json.loads(encoded)
-
-
-def _extract_metadata_exiftool(image_path: str) -> dict:
-    """Extract all metadata from image using ExifTool."""
-    cmd = ["exiftool", "-json", "-a", "-G1", image_path]
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-    if result.returncode != 0:
-        logger.warning("ExifTool stderr: %s", result.stderr[:200])
+    """Decode Golden Codex payload: base64 → gzip → JSON.
+
+    The payload is always a single gzip member, so a one-shot
+    ``zlib.decompress`` with gzip framing (``wbits=31``) replaces
+    ``gzip.decompress`` and its GzipFile machinery.
+    """
     try:
-        metadata_list = json.loads(result.stdout)
-        return metadata_list[0] if metadata_list else {}
-    except json.JSONDecodeError as e:
-        logger.error("Failed to parse ExifTool output: %s", e)
-        return {}
+        json_bytes = zlib.decompress(base64.b64decode(encoded), wbits=31)
+    except (zlib.error, binascii.Error, ValueError):
+        # Not base64/gzip (ValueError: non-ASCII text) -- legacy uncompressed JSON
+        return orjson.loads(encoded)
+    return orjson.loads(json_bytes)
+
+
+def _png_text_xmp(chunk_type: bytes, data: bytes) -> Optional[bytes]:
+    """Return the XMP packet from a PNG iTXt/tEXt chunk, or None if it isn't XMP."""
+    keyword, _, rest = data.partition(b"\0")
+    if not keyword.startswith(_XMP_KEYWORDS):
+        return None
+    if chunk_type == b"tEXt":
+        return rest
+    # iTXt: compression flag, compression method, language\0, translated keyword\0, text
+    compressed = rest[:1] == b"\1"
+    _, _, rest = rest[2:].partition(b"\0")
+    _, _, text = rest.partition(b"\0")
+    return zlib.decompress(text) if compressed else text
+
+
+def _fast_png_metadata(head: bytes) -> Optional[dict]:
+    """Pull the Golden Codex payload straight out of a PNG's leading bytes.
+
+    Walks the chunk list of a ranged read looking for the XMP text chunk.
+    Returns a minimal ExifTool-shaped metadata dict (payload, dimensions,
+    file type), or None when the payload isn't within ``head`` — the
+    caller then falls back to a full download + ExifTool.
+    """
+    if not head.startswith(_PNG_SIGNATURE):
+        return None
+
+    metadata = {"File:FileType": "PNG"}
+    pos = len(_PNG_SIGNATURE)
+    while pos + 8 <= len(head):
+        length, chunk_type = struct.unpack_from(">I4s", head, pos)
+        start = pos + 8
+        end = start + length
+        if end > len(head) or chunk_type in (b"IDAT", b"IEND"):
+            return None
+
+        if chunk_type == b"IHDR":
+            width, height = struct.unpack_from(">II", head, start)
+            metadata["PNG:ImageWidth"] = width
+            metadata["PNG:ImageHeight"] = height
+            metadata["Composite:Megapixels"] = round(width * height / 1_000_000, 1)
+        elif chunk_type in (b"iTXt", b"tEXt"):
+            try:
+                xmp = _png_text_xmp(chunk_type, head[start:end])
+            except zlib.error:
+                xmp = None
+            match = _CODEX_XMP_RE.search(xmp) if xmp else None
+            if match:
+                prefix, name, value = match.group(1, 2, 3) if match.group(1) else match.group(4, 5, 6)
+                metadata[f"XMP-{prefix.decode()}:{name.decode()}"] = value.decode().strip()
+                return metadata
+
+        pos = end + 4  # skip CRC
+    return None
 
 
 def _find_codex_payload(metadata: dict) -> Optional[str]:
     """Find Golden Codex payload in metadata, checking multiple field variants."""
-    for field in CODEX_PAYLOAD_FIELDS:
-        if field in metadata and metadata[field]:
-            logger.info("Found Golden Codex in field: %s", field)
-            return metadata[field]
-    # Fallback: scan all keys
+    if not _CODEX_FIELDS_SET.isdisjoint(metadata):
+        for field in CODEX_PAYLOAD_FIELDS:  # priority order
+            value = metadata.get(field)
+            if value:
+                logger.info("Found Golden Codex in field: %s", field)
+                return value
+    # Fallback: single pass over all keys, cheap value checks first
     for key, value in metadata.items():
+        if not isinstance(value, str) or len(value) <= 50:
+            continue
         key_lower = key.lower()
-        if ("codexpayload" in key_lower or "goldencodex" in key_lower):
-            if value and isinstance(value, str) and len(value) > 50:
-                logger.info("Found Golden Codex in field: %s", key)
-                return value
+        if any(sub in key_lower for sub in _CODEX_SUBSTRINGS):
+            logger.info("Found Golden Codex in field: %s", key)
+            return value
     return None
 
 
-def _calculate_verification(raw_metadata: dict, golden_codex: dict | None) -> dict:
-    """Calculate verification score and stats."""
-    total_exif_fields = sum(1 for v in raw_metadata.values() if v)
+def _calculate_verification(
+    raw_metadata: dict, golden_codex: dict | None, partial: bool = False,
+) -> dict:
+    """Calculate verification score and stats.
+
+    ``partial`` marks metadata from the PNG fast path, which only carries a
+    handful of fields -- the EXIF field count is omitted rather than
+    under-reported.
+    """
+    total_exif_fields = None if partial else sum(1 for v in raw_metadata.values() if v)
     has_codex = golden_codex is not None
     codex_fields = 0
     codex_sections = []
@@ -114,8 +290,9 @@ def _calculate_verification(raw_metadata: dict, golden_codex: dict | None) -> di
 
     return {
         "golden_codex_detected": has_codex,
-        "richness": "golden" if has_codex else ("rich" if total_exif_fields > 20 else "minimal"),
+        "richness": "golden" if has_codex else ("rich" if (total_exif_fields or 0) > 20 else "minimal"),
         "exif_fields_total": total_exif_fields,
+        "exif_scan": "partial" if partial else "full",
         "codex_top_level_sections": len(codex_sections),
         "codex_total_fields": codex_fields,
         "sections_found": codex_sections,
@@ -124,52 +301,60 @@ def _calculate_verification(raw_metadata: dict, golden_codex: dict | None) -> di
     }
 
 
-def _reader_x402_headers(amount: float) -> dict:
-    """Build x402 payment headers for reader 402 response."""
-    import base64 as b64
-    x402_network = os.environ.get("X402_NETWORK", "eip155:8453")
-    usdc_addresses = {
-        "eip155:8453": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
-        "eip155:84532": "0x036CbD53842c5426634e7929541eC2318f3dCF7e",
-    }
-    eip712_domains = {
-        "eip155:8453": {"name": "USD Coin", "version": "2"},
-        "eip155:84532": {"name": "USDC", "version": "2"},
-    }
-    amount_smallest = str(int(round(amount * 1_000_000)))
+@functools.lru_cache(maxsize=16)
+def _build_x402_headers_cached(amount_smallest: str, amount_display: str) -> Mapping[str, str]:
+    """Build (once per amount) the x402 payment headers for a reader 402 response."""
     payload = {
         "x402Version": 2,
         "accepts": [{
             "scheme": "exact",
-            "network": x402_network,
-            "asset": usdc_addresses.get(x402_network, usdc_addresses["eip155:8453"]),
+            "network": X402_NETWORK,
+            "asset": _USDC_ADDRESSES.get(X402_NETWORK, _USDC_ADDRESSES["eip155:8453"]),
             "amount": amount_smallest,
             "payTo": BASE_WALLET_ADDRESS,
             "maxTimeoutSeconds": 300,
-            "extra": eip712_domains.get(x402_network, eip712_domains["eip155:8453"]),
+            "extra": _EIP712_DOMAINS.get(X402_NETWORK, _EIP712_DOMAINS["eip155:8453"]),
         }],
     }
-    encoded = b64.b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
-    return {
+    encoded = base64.b64encode(orjson.dumps(payload)).decode()
+    return MappingProxyType({
         "PAYMENT-REQUIRED": encoded,
-        "X-PAYMENT-REQUIRED": str(amount),
+        "X-PAYMENT-REQUIRED": amount_display,
         "X-PAYMENT-CURRENCY": "USDC",
         "X-PAYMENT-CHAIN": "base",
         "X-PAYMENT-RECIPIENT": BASE_WALLET_ADDRESS,
-    }
+    })
+
+
+@functools.lru_cache(maxsize=16)
+def _usdc_smallest(amount: float) -> str:
+    """USD amount → USDC smallest units (6 decimals), exact via Decimal."""
+    return str((Decimal(str(amount)) * 1_000_000).to_integral_value())
+
+
+def _reader_x402_headers(amount: float) -> Mapping[str, str]:
+    """x402 payment headers for reader 402 response (read-only, cached)."""
+    return _build_x402_headers_cached(_usdc_smallest(amount), str(amount))
 
 
 async def _check_buyer_history(db, fingerprint: str) -> bool:
     """Check if this client has any x402 purchase history → unlimited reads."""
+    buyer_ip = fingerprint.split("|")[0]
+    cached = _buyer_cache.get(buyer_ip)
+    if cached is not None:
+        return cached
     try:
         query = db.collection("data_portal_transactions").where(
-            "buyer_ip", "==", fingerprint.split("|")[0]
+            "buyer_ip", "==", buyer_ip
         ).limit(1)
-        docs = [doc async for doc in query.stream()]
-        return len(docs) > 0
+        # count() aggregation: the server returns an integer, not the document
+        result = await query.count().get()
+        is_buyer = result[0][0].value > 0
     except Exception as e:
         logger.warning("Buyer history check failed: %s", e)
         return False
+    _buyer_cache[buyer_ip] = is_buyer
+    return is_buyer
 
 
 # ---------------------------------------------------------------------------
@@ -244,6 +429,19 @@ async def read_artifact(artifact_id: str, request: Request):
 
     This proves the metadata lives INSIDE the image — not in a database.
     """
+    # Validate artifact ID format and range before any Firestore/GCS work
+    match = _ARTIFACT_RE.match(artifact_id)
+    if not match or not (1 <= int(match.group(1)) <= MAX_ARTIFACT_NUMBER):
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Invalid artifact ID format",
+                "expected": "GCX-AA-{00001-10090}",
+                "example": "GCX-AA-00042",
+                "hint": "Use GET /agent/reader for documentation",
+            },
+        )
+
     db = request.state.db
     fingerprint = get_client_fingerprint(request)
     paid_this_read = False
@@ -299,50 +497,28 @@ async def read_artifact(artifact_id: str, request: Request):
                 )
             paid_this_read = True
 
-    # Validate artifact ID format
-    if not artifact_id.startswith("GCX-AA-"):
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "error": "Invalid artifact ID format",
-                "expected": "GCX-AA-{00001-10090}",
-                "example": "GCX-AA-00042",
-                "hint": "Use GET /agent/reader for documentation",
-            },
-        )
-
     # Download the infused image from GCS
     blob_path = f"{IMAGES_PREFIX}/{artifact_id}_final.png"
     logger.info("Reader: downloading %s/%s", ASSETS_BUCKET, blob_path)
 
     try:
-        client = gcs.Client()
-        bucket = client.bucket(ASSETS_BUCKET)
-        blob = bucket.blob(blob_path)
-
-        if not blob.exists():
-            raise HTTPException(
-                status_code=404,
-                detail={
-                    "error": f"Artifact not found: {artifact_id}",
-                    "hint": "Valid range: GCX-AA-00001 through GCX-AA-10090",
-                },
-            )
-
-        # Download to temp file
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-            blob.download_to_filename(tmp.name)
-            tmp_path = tmp.name
-
-    except HTTPException:
-        raise
+        raw_metadata, tmp_path = await asyncio.to_thread(_download_image, blob_path)
+    except NotFound:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": f"Artifact not found: {artifact_id}",
+                "hint": "Valid range: GCX-AA-00001 through GCX-AA-10090",
+            },
+        )
     except Exception as e:
         logger.error("GCS download failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to download image: {e}")
 
     try:
-        # Extract metadata with ExifTool
-        raw_metadata = _extract_metadata_exiftool(tmp_path)
+        if tmp_path:
+            # Extract metadata with the shared ExifTool daemon
+            raw_metadata = await request.app.state.exiftool.extract(tmp_path)
         logger.info("Reader: extracted %d metadata fields from %s", len(raw_metadata), artifact_id)
 
         # Find and decode Golden Codex payload
@@ -357,15 +533,15 @@ async def read_artifact(artifact_id: str, request: Request):
                 logger.warning("Reader: failed to decode payload from %s: %s", artifact_id, e)
 
         # Build verification report
-        verification = _calculate_verification(raw_metadata, golden_codex)
+        verification = _calculate_verification(raw_metadata, golden_codex, partial=tmp_path is None)
 
-        # Extract basic image info
+        # Extract basic image info (lowercase each key once, not once per field)
+        lowered_keys = [(key.lower(), key) for key in raw_metadata]
         image_info = {}
-        for field in ["ImageWidth", "ImageHeight", "FileSize", "FileType", "Megapixels"]:
-            for key, value in raw_metadata.items():
-                if field.lower() in key.lower():
-                    image_info[field] = value
-                    break
+        for field, wanted in _IMAGE_INFO_FIELDS:
+            key = next((key for lowered, key in lowered_keys if wanted in lowered), None)
+            if key is not None:
+                image_info[field] = raw_metadata[key]
 
         response = {
             "artifact_id": artifact_id,
@@ -407,7 +583,8 @@ async def read_artifact(artifact_id: str, request: Request):
         return response
 
     finally:
-        try:
-            os.unlink(tmp_path)
-        except Exception:
-            pass
+        if tmp_path:
+            try:
+                os.unlink(tmp_path)
+            except Exception:
+                pass
@@ -6,21 +6,143 @@ Tracks cumulative Oracle record purchases per wallet address over a
 and triggers enterprise outreach metadata when spend exceeds $200.
 
 Storage: Firestore collection `agent_volume_tracking/{wallet_address}`
+holding the 30-day counters, with one doc per wallet-hour in its `events`
+subcollection (`events/{YYYYMMDDHH}`) summing that hour's purchases, so a
+wallet holds at most ~720 event docs however often it buys. Event docs
+carry an `expire_at` timestamp for a Firestore TTL policy (configure on
+collection group `events`, field `expire_at`), so old events are deleted
+server-side. Counters are maintained with
+atomic increments and recomputed from the live events once per
+RECONCILE_INTERVAL_MS to drop purchases that have left the window.
+
+Writes are coalesced: `record_purchase` answers from the in-process
+running totals and queues the mutation; a background flusher commits
+queued purchases in WriteBatches -- within FLUSH_INTERVAL when a wallet
+changes tier, otherwise lazily every DEFERRED_FLUSH_INTERVAL.
 """
 
 from __future__ import annotations
 
+import asyncio
+import itertools
 import logging
-from datetime import datetime, timezone, timedelta
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
 
-from google.cloud.firestore import AsyncClient
+from cachetools import TTLCache
+from google.api_core.exceptions import FailedPrecondition
+from google.cloud.firestore import DELETE_FIELD, AsyncClient, Increment
 
-from pricing import get_volume_price, ENTERPRISE_OUTREACH_THRESHOLD_USD
+from pricing import VOLUME_TIERS, get_volume_price, ENTERPRISE_OUTREACH_THRESHOLD_USD
 
 logger = logging.getLogger("data-portal.volume")
 
 COLLECTION = "agent_volume_tracking"
+EVENTS_SUBCOLLECTION = "events"
+ENTERPRISE_LEADS_COLLECTION = "enterprise_leads"
 WINDOW_DAYS = 30
+WINDOW_MS = WINDOW_DAYS * 86_400_000
+BUCKET_MS = 3_600_000  # purchases are summed into one event doc per wallet-hour
+RECONCILE_INTERVAL_MS = 86_400_000  # rebuild a wallet's counters at most daily
+RECONCILE_RETRY_DELAYS = (0.01, 0.04, 0.16)  # seconds between re-reads when a reconcile races a write
+
+FLUSH_INTERVAL = 0.05     # seconds a flush waits when a wallet changed tier
+DEFERRED_FLUSH_INTERVAL = 1.0  # seconds it waits when every queued purchase kept its tier
+FLUSH_MAX_WRITES = 400    # writes per WriteBatch (Firestore hard limit is 500)
+FLUSH_RETRY_BASE = 0.5    # seconds before re-committing a failed batch, doubled per failure
+FLUSH_RETRY_MAX = 30.0    # cap on that backoff
+CLOSE_TIMEOUT = 5.0       # seconds shutdown waits for queued purchases to commit
+TOTALS_CACHE_TTL = 60     # seconds before a wallet's totals are re-read
+
+# Spend is carried as integer micro-USD (USDC's 6 decimals): exact under
+# Increment and summation, and fine enough for sub-cent per-record prices
+MICROS_PER_USD = 1_000_000
+ENTERPRISE_OUTREACH_THRESHOLD_MICROS = round(ENTERPRISE_OUTREACH_THRESHOLD_USD * MICROS_PER_USD)
+
+ENTERPRISE_MSG_TEMPLATE = (
+    "You've spent $%.2f in the last 30 days. "
+    "Enterprise licenses start at $8,000 with full compliance manifests "
+    "and unlimited API access. Contact enterprise@iaeternum.ai"
+)
+
+# Projection for counter reads -- skips everything else on the wallet doc,
+# notably a legacy in-document events array that can run to hundreds of KB
+_COUNTER_FIELDS = ["records_30d", "spend_30d_micros", "reconciled_at"]
+
+
+@dataclass
+class _PendingPurchase:
+    wallet_address: str
+    records: int
+    amount_micros: int
+    endpoint: str
+    ts_ms: int    # UNIX ms; Firestore timestamps are only built at flush time
+    is_new: bool  # no parent doc seen yet -- the write also sets first_seen
+    urgent: bool = True  # changes the wallet's persisted tier -- flush promptly
+    # (records_30d, spend_30d_micros) when this purchase crossed the enterprise threshold
+    lead_totals: Optional[tuple[int, int]] = None
+
+    @property
+    def writes(self) -> int:
+        """Most batch writes this purchase needs: event bucket, counters, maybe a lead."""
+        return 2 if self.lead_totals is None else 3
+
+
+def _tier_floor(total_records: int) -> int:
+    """The ``min`` of the volume tier ``total_records`` falls in."""
+    return next((t["min"] for t in VOLUME_TIERS if total_records >= t["min"]), 0)
+
+
+def _crosses_threshold(before: tuple[int, int], after: tuple[int, int]) -> bool:
+    """Whether moving from ``before`` to ``after`` totals changes tier or outreach."""
+    return (
+        _tier_floor(before[0]) != _tier_floor(after[0])
+        or (before[1] >= ENTERPRISE_OUTREACH_THRESHOLD_MICROS)
+        != (after[1] >= ENTERPRISE_OUTREACH_THRESHOLD_MICROS)
+    )
+
+
+def _usd_to_micros(amount_usd: float) -> int:
+    return round(amount_usd * MICROS_PER_USD)
+
+
+def _stored_spend_micros(data: dict) -> int:
+    """Wallet spend in micro-USD, converting a pre-integer float ``spend_30d``."""
+    if "spend_30d_micros" in data:
+        return data["spend_30d_micros"]
+    return _usd_to_micros(data.get("spend_30d", 0.0))
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def _ms_to_datetime(ms: int) -> datetime:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+def _bucket_id(bucket_ms: int) -> str:
+    return _ms_to_datetime(bucket_ms).strftime("%Y%m%d%H")
+
+
+def _datetime_to_ms(value: datetime) -> int:
+    return int(value.timestamp() * 1000)
+
+
+def _tier_info(total_records: int, total_spend_micros: int) -> dict:
+    """Volume tier plus enterprise-outreach fields for given 30-day totals."""
+    total_spend = total_spend_micros / MICROS_PER_USD
+    tier_info = get_volume_price(total_records)
+    tier_info["spend_30d"] = round(total_spend, 2)
+    tier_info["enterprise_outreach"] = total_spend_micros >= ENTERPRISE_OUTREACH_THRESHOLD_MICROS
+
+    if tier_info["enterprise_outreach"]:
+        tier_info["enterprise_message"] = ENTERPRISE_MSG_TEMPLATE % total_spend
+
+    return tier_info
 
 
 class VolumeTracker:
@@ -28,9 +150,38 @@ class VolumeTracker:
 
     def __init__(self):
         self._db: AsyncClient | None = None
+        self._db_cycle: Optional[itertools.cycle] = None
+        # wallet -> (records_30d, spend_30d_micros) including queued purchases
+        self._totals: TTLCache = TTLCache(maxsize=10_000, ttl=TOTALS_CACHE_TTL)
+        self._queue: asyncio.Queue[_PendingPurchase] = asyncio.Queue()
+        self._flusher: Optional[asyncio.Task] = None
 
     def set_db(self, db: AsyncClient):
-        self._db = db
+        """Attach Firestore and start the write flusher (call from the running loop)."""
+        self.set_db_pool([db])
+
+    def set_db_pool(self, dbs: list[AsyncClient]):
+        """Attach a pool of Firestore clients, used round-robin.
+
+        Each client has its own gRPC channel (one HTTP/2 connection with a
+        bounded number of concurrent streams); rotating across a few keeps
+        bursts of tracker traffic from queueing on a single channel.
+        """
+        self._db = dbs[0]
+        self._db_cycle = itertools.cycle(dbs)
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        """Commit anything still queued (for up to CLOSE_TIMEOUT), then stop the flusher."""
+        if self._flusher is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), CLOSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.error("Volume flush did not drain on shutdown; %d purchase(s) lost", self._queue.qsize())
+        self._flusher.cancel()
+        self._flusher = None
 
     async def record_purchase(
         self,
@@ -41,6 +192,9 @@ class VolumeTracker:
     ) -> dict:
         """Record a purchase and return the current volume tier.
 
+        The tier is computed from the running totals; the Firestore write
+        is queued for the background flusher.
+
         Args:
             wallet_address: The x402 buyer wallet address.
             records: Number of records purchased in this transaction.
@@ -53,87 +207,398 @@ class VolumeTracker:
         if not self._db or not wallet_address:
             return get_volume_price(0)
 
-        doc_ref = self._db.collection(COLLECTION).document(wallet_address)
-        now = datetime.now(timezone.utc)
-        window_start = now - timedelta(days=WINDOW_DAYS)
+        now_ms = _now_ms()
+        amount_micros = _usd_to_micros(amount_usd)
 
-        try:
-            doc = await doc_ref.get()
-
-            if doc.exists:
-                data = doc.to_dict()
-                # Prune events older than 30 days
-                events = [
-                    e for e in data.get("events", [])
-                    if e.get("timestamp", now) > window_start
-                ]
-                events.append({
-                    "timestamp": now,
-                    "records": records,
-                    "amount_usd": amount_usd,
-                    "endpoint": endpoint,
-                })
-
-                total_records = sum(e.get("records", 0) for e in events)
-                total_spend = sum(e.get("amount_usd", 0) for e in events)
-
-                await doc_ref.set({
-                    "wallet_address": wallet_address,
-                    "events": events,
-                    "records_30d": total_records,
-                    "spend_30d": round(total_spend, 2),
-                    "last_updated": now,
-                    "first_seen": data.get("first_seen", now),
-                })
+        totals = self._totals.get(wallet_address)
+        is_new = False
+        if totals is None:
+            # Only the counter read can fail here; the purchase is still
+            # queued so a Firestore blip doesn't lose it
+            try:
+                loaded, is_new = await self._load_totals(wallet_address, now_ms)
+            except Exception as exc:
+                logger.warning("Volume tracking failed for %s: %s", wallet_address[:10], exc)
+                self._queue.put_nowait(_PendingPurchase(
+                    wallet_address, records, amount_micros, endpoint, now_ms, False,
+                ))
+                return get_volume_price(0)
+            # A concurrent purchase for this wallet may have filled the cache
+            # while we awaited; build on its running totals so neither
+            # increment is lost
+            totals = self._totals.get(wallet_address)
+            if totals is None:
+                totals = loaded
             else:
-                total_records = records
-                total_spend = amount_usd
-                await doc_ref.set({
-                    "wallet_address": wallet_address,
-                    "events": [{
-                        "timestamp": now,
-                        "records": records,
-                        "amount_usd": amount_usd,
-                        "endpoint": endpoint,
-                    }],
-                    "records_30d": total_records,
-                    "spend_30d": round(total_spend, 2),
-                    "last_updated": now,
-                    "first_seen": now,
-                })
-
-            # Calculate current tier
-            tier_info = get_volume_price(total_records)
-            tier_info["spend_30d"] = round(total_spend, 2)
-            tier_info["enterprise_outreach"] = total_spend >= ENTERPRISE_OUTREACH_THRESHOLD_USD
-
-            if tier_info["enterprise_outreach"]:
-                tier_info["enterprise_message"] = (
-                    "You've spent ${:.2f} in the last 30 days. "
-                    "Enterprise licenses start at $8,000 with full compliance manifests "
-                    "and unlimited API access. Contact enterprise@iaeternum.ai"
-                ).format(total_spend)
-
-            return tier_info
-
-        except Exception as exc:
-            logger.warning("Volume tracking failed for %s: %s", wallet_address[:10], exc)
-            return get_volume_price(0)
+                is_new = False
+
+        return _tier_info(*self._apply(
+            wallet_address, totals, records, amount_micros, endpoint, now_ms, is_new,
+        ))
+
+    async def record_purchases(
+        self,
+        purchases: list[tuple[str, int, float, str]],
+    ) -> dict[str, dict]:
+        """Record many purchases at once and return each wallet's volume tier.
+
+        Wallets missing from the totals cache are loaded concurrently, and
+        the queued writes land in the same flusher batches, so N wallets
+        cost one round of reads and a shared commit rather than N of each.
+
+        Args:
+            purchases: ``(wallet_address, records, amount_usd, endpoint)`` tuples.
+
+        Returns:
+            dict of wallet address -> tier info after all of its purchases.
+        """
+        by_wallet: dict[str, list[tuple[int, int, str]]] = {}
+        for wallet_address, records, amount_usd, endpoint in purchases:
+            if wallet_address:
+                by_wallet.setdefault(wallet_address, []).append(
+                    (records, _usd_to_micros(amount_usd), endpoint)
+                )
+        if not self._db:
+            return {w: get_volume_price(0) for w in by_wallet}
+
+        now_ms = _now_ms()
+        cached = {w: self._totals.get(w) for w in by_wallet}
+        missing = [w for w, totals in cached.items() if totals is None]
+        loaded = await asyncio.gather(
+            *(self._load_totals(w, now_ms) for w in missing), return_exceptions=True,
+        )
+        loaded_by_wallet = dict(zip(missing, loaded))
+
+        tiers: dict[str, dict] = {}
+        for wallet_address, wallet_purchases in by_wallet.items():
+            result = loaded_by_wallet.get(wallet_address)
+            if isinstance(result, Exception):
+                logger.warning("Volume tracking failed for %s: %s", wallet_address[:10], result)
+                for records, amount_micros, endpoint in wallet_purchases:
+                    self._queue.put_nowait(_PendingPurchase(
+                        wallet_address, records, amount_micros, endpoint, now_ms, False,
+                    ))
+                tiers[wallet_address] = get_volume_price(0)
+                continue
+
+            # As in record_purchase: concurrent purchases may have moved the
+            # cached totals while the loads were awaited, so build on those
+            current = self._totals.get(wallet_address)
+            if current is not None:
+                totals, is_new = current, False
+            elif result is None:
+                totals, is_new = cached[wallet_address], False
+            else:
+                totals, is_new = result
+            for records, amount_micros, endpoint in wallet_purchases:
+                totals = self._apply(
+                    wallet_address, totals, records, amount_micros, endpoint, now_ms, is_new,
+                )
+                is_new = False
+            tiers[wallet_address] = _tier_info(*totals)
+
+        return tiers
+
+    def _apply(
+        self,
+        wallet_address: str,
+        totals: tuple[int, int],
+        records: int,
+        amount_micros: int,
+        endpoint: str,
+        now_ms: int,
+        is_new: bool,
+    ) -> tuple[int, int]:
+        """Add one purchase to the running totals and queue its write.
+
+        Returns the wallet's new ``(records_30d, spend_30d_micros)``.
+        """
+        total_records = totals[0] + records
+        total_spend_micros = totals[1] + amount_micros
+        self._totals[wallet_address] = (total_records, total_spend_micros)
+        # Purchases that leave the tier unchanged can wait for a lazier flush
+        urgent = is_new or _crosses_threshold(totals, (total_records, total_spend_micros))
+        # Record an enterprise lead on the purchase that crosses the threshold
+        lead_totals = (
+            (total_records, total_spend_micros)
+            if totals[1] < ENTERPRISE_OUTREACH_THRESHOLD_MICROS <= total_spend_micros else None
+        )
+        self._queue.put_nowait(_PendingPurchase(
+            wallet_address, records, amount_micros, endpoint, now_ms, is_new, urgent, lead_totals,
+        ))
+        return total_records, total_spend_micros
+
+    def _client(self) -> AsyncClient:
+        return next(self._db_cycle)
+
+    async def _load_totals(self, wallet_address: str, now_ms: int) -> tuple[tuple[int, int], bool]:
+        """Read a wallet's counters (reconciling them if due).
+
+        Docs still carrying a float ``spend_30d`` are reconciled straight
+        away, which rewrites them with the integer counter.
+
+        Returns ``((records_30d, spend_30d_micros), is_new)``.
+        """
+        doc_ref = self._client().collection(COLLECTION).document(wallet_address)
+        doc = await doc_ref.get(field_paths=_COUNTER_FIELDS)
+        if not doc.exists:
+            return (0, 0), True
+
+        data = doc.to_dict()
+        reconciled_at = data.get("reconciled_at")
+        if (
+            reconciled_at is None
+            or "spend_30d_micros" not in data
+            or _datetime_to_ms(reconciled_at) <= now_ms - RECONCILE_INTERVAL_MS
+        ):
+            return await self._reconcile(doc_ref, now_ms), False
+        return (data.get("records_30d", 0), data["spend_30d_micros"]), False
+
+    # ------------------------------------------------------------------
+    # Write coalescing
+    # ------------------------------------------------------------------
+
+    async def _flush_loop(self):
+        """Drain the purchase queue into WriteBatches until cancelled.
+
+        A batch closes FLUSH_INTERVAL after its first tier-changing purchase,
+        or DEFERRED_FLUSH_INTERVAL after it opened if none changed a tier --
+        routine purchases from hot wallets collapse into fewer commits.
+
+        A failed commit puts its purchases back on the queue (they were
+        already acknowledged to callers) and pauses with exponential backoff.
+        """
+        loop = asyncio.get_running_loop()
+        failures = 0
+        while True:
+            pending = [await self._queue.get()]
+            deadline = loop.time() + (FLUSH_INTERVAL if pending[0].urgent else DEFERRED_FLUSH_INTERVAL)
+            # Leave room for the largest purchase (three writes) in the batch
+            writes = pending[0].writes
+            while writes + 3 <= FLUSH_MAX_WRITES:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    purchase = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(purchase)
+                writes += purchase.writes
+                if purchase.urgent:
+                    deadline = min(deadline, loop.time() + FLUSH_INTERVAL)
+
+            try:
+                await self._commit(pending)
+            except Exception as exc:
+                failures += 1
+                for purchase in pending:
+                    self._queue.put_nowait(purchase)
+                logger.warning(
+                    "Volume flush failed (attempt %d), requeued %d purchase(s): %s",
+                    failures, len(pending), exc,
+                )
+            else:
+                failures = 0
+            finally:
+                for _ in pending:
+                    self._queue.task_done()
+
+            if failures:
+                await asyncio.sleep(min(FLUSH_RETRY_BASE * 2 ** (failures - 1), FLUSH_RETRY_MAX))
+
+    async def _commit(self, pending: list[_PendingPurchase]):
+        """Write one batch: an event-bucket update per wallet-hour, one counter
+        update per wallet, and an ``enterprise_leads`` doc for threshold
+        crossings.
+
+        Bucket and counter updates are merge-sets with Increment, which also
+        create missing docs, so no existence checks are needed.
+        """
+        db = self._client()
+        per_wallet: dict[str, dict] = {}
+        per_bucket: dict[tuple[str, int], dict] = {}
+        batch = db.batch()
+        for purchase in pending:
+            timestamp = _ms_to_datetime(purchase.ts_ms)
+
+            bucket_ms = purchase.ts_ms - purchase.ts_ms % BUCKET_MS
+            bucket = per_bucket.get((purchase.wallet_address, bucket_ms))
+            if bucket is None:
+                bucket = per_bucket[(purchase.wallet_address, bucket_ms)] = {
+                    "records": 0,
+                    "amount_micros": 0,
+                    "purchases": 0,
+                    "endpoints": {},
+                }
+            bucket["records"] += purchase.records
+            bucket["amount_micros"] += purchase.amount_micros
+            bucket["purchases"] += 1
+            endpoints = bucket["endpoints"]
+            endpoints[purchase.endpoint] = endpoints.get(purchase.endpoint, 0) + purchase.records
+
+            update = per_wallet.get(purchase.wallet_address)
+            if update is None:
+                update = per_wallet[purchase.wallet_address] = {
+                    "wallet_address": purchase.wallet_address,
+                    "records_30d": 0,
+                    "spend_30d_micros": 0,
+                }
+            update["records_30d"] += purchase.records
+            update["spend_30d_micros"] += purchase.amount_micros
+            update["last_updated"] = timestamp
+            if purchase.is_new and "first_seen" not in update:
+                update["first_seen"] = update["reconciled_at"] = timestamp
+
+            if purchase.lead_totals is not None:
+                records_30d, spend_30d_micros = purchase.lead_totals
+                batch.set(db.collection(ENTERPRISE_LEADS_COLLECTION).document(purchase.wallet_address), {
+                    "wallet_address": purchase.wallet_address,
+                    "records_30d": records_30d,
+                    "spend_30d_micros": spend_30d_micros,
+                    "detected_at": timestamp,
+                    "source": "volume_tracker",
+                }, merge=True)
+
+        for (wallet_address, bucket_ms), bucket in per_bucket.items():
+            events_ref = db.collection(COLLECTION).document(wallet_address).collection(EVENTS_SUBCOLLECTION)
+            batch.set(events_ref.document(_bucket_id(bucket_ms)), {
+                "timestamp": _ms_to_datetime(bucket_ms),
+                # The bucket's last purchase leaves the window one bucket after its start does
+                "expire_at": _ms_to_datetime(bucket_ms + BUCKET_MS + WINDOW_MS),
+                "records": Increment(bucket["records"]),
+                "amount_micros": Increment(bucket["amount_micros"]),
+                "purchases": Increment(bucket["purchases"]),
+                "endpoints": {ep: Increment(n) for ep, n in bucket["endpoints"].items()},
+            }, merge=True)
+
+        for wallet_address, update in per_wallet.items():
+            update["records_30d"] = Increment(update["records_30d"])
+            update["spend_30d_micros"] = Increment(update["spend_30d_micros"])
+            batch.set(db.collection(COLLECTION).document(wallet_address), update, merge=True)
+
+        await batch.commit()
+
+    # ------------------------------------------------------------------
+    # Window reconciliation
+    # ------------------------------------------------------------------
+
+    async def _reconcile(self, doc_ref, now_ms: int) -> tuple[int, int]:
+        """Rebuild the 30-day counters from the events still in the window.
+
+        Events expire via TTL rather than being subtracted, so the counters
+        drift upward until this runs. Also folds in any legacy in-document
+        ``events`` array, dropping its expired entries (and the field once
+        empty). Conditional on the snapshot's update time: if a purchase
+        lands meanwhile, the wallet is re-read and re-summed after each of
+        RECONCILE_RETRY_DELAYS; once those run out the stored counters are
+        returned and the next read tries again.
+
+        Returns the ``(records, spend_micros)`` totals for the window.
+        """
+        now = _ms_to_datetime(now_ms)
+        window_start = _ms_to_datetime(now_ms - WINDOW_MS)
+        # Hourly buckets are keyed by their start, so one still counts while
+        # any of its hour is in the window
+        bucket_window_start = _ms_to_datetime(now_ms - WINDOW_MS - BUCKET_MS)
+
+        for retry_delay in (*RECONCILE_RETRY_DELAYS, None):
+            doc = await doc_ref.get(field_paths=[*_COUNTER_FIELDS, "spend_30d", "events"])
+            data = doc.to_dict() or {}
+
+            # Sum on the server: no event documents cross the wire
+            query = doc_ref.collection(EVENTS_SUBCOLLECTION).where("timestamp", ">", bucket_window_start)
+            aggregation = query.sum("records", alias="records").sum("amount_micros", alias="amount_micros")
+            sums = {result.alias: result.value for result in (await aggregation.get())[0]}
+            total_records = int(sums.get("records") or 0)
+            total_spend_micros = int(sums.get("amount_micros") or 0)
+
+            # The legacy array is append-only, so already in timestamp order
+            events = data.get("events", [])
+            legacy = events[bisect_right(events, window_start, key=lambda e: e.get("timestamp", now)):]
+            total_records += sum(e.get("records", 0) for e in legacy)
+            total_spend_micros += sum(_usd_to_micros(e.get("amount_usd", 0)) for e in legacy)
+
+            try:
+                await doc_ref.update(
+                    {
+                        "events": legacy or DELETE_FIELD,
+                        "records_30d": total_records,
+                        "spend_30d_micros": total_spend_micros,
+                        "spend_30d": DELETE_FIELD,
+                        "reconciled_at": now,
+                    },
+                    option=self._db.write_option(last_update_time=doc.update_time),
+                )
+            except FailedPrecondition:
+                if retry_delay is None:
+                    logger.debug("Volume reconcile kept racing purchases for %s; deferring", doc_ref.id)
+                    return data.get("records_30d", 0), _stored_spend_micros(data)
+                await asyncio.sleep(retry_delay)
+                continue
+            return total_records, total_spend_micros
 
     async def get_tier(self, wallet_address: str) -> dict:
-        """Get the current volume tier for a wallet without recording a purchase."""
+        """Get the current volume tier for a wallet without recording a purchase.
+
+        Served from the running-totals cache that ``record_purchase`` keeps
+        current; a miss costs one read and populates it.
+        """
         if not self._db or not wallet_address:
             return get_volume_price(0)
 
-        try:
-            doc = await self._db.collection(COLLECTION).document(wallet_address).get()
-            if doc.exists:
-                data = doc.to_dict()
-                return get_volume_price(data.get("records_30d", 0))
-        except Exception as exc:
-            logger.warning("Volume tier lookup failed: %s", exc)
-
-        return get_volume_price(0)
+        totals = self._totals.get(wallet_address)
+        if totals is None:
+            try:
+                totals, _ = await self._load_totals(wallet_address, _now_ms())
+            except Exception as exc:
+                logger.warning("Volume tier lookup failed: %s", exc)
+                return get_volume_price(0)
+            self._totals[wallet_address] = totals
+
+        return get_volume_price(totals[0])
+
+    async def get_tiers(self, wallet_addresses: list[str]) -> dict[str, dict]:
+        """Get volume tiers for many wallets with one batched ``get_all`` read.
+
+        Cached wallets are answered locally; the rest are fetched together.
+        Counters that are due for reconciliation are used as stored (not
+        cached) and get rebuilt on that wallet's next purchase.
+        """
+        totals: dict[str, tuple[int, int]] = {}
+        missing = []
+        for wallet_address in dict.fromkeys(w for w in wallet_addresses if w):
+            cached = self._totals.get(wallet_address)
+            if cached is not None:
+                totals[wallet_address] = cached
+            else:
+                missing.append(wallet_address)
+
+        if self._db and missing:
+            stale_before_ms = _now_ms() - RECONCILE_INTERVAL_MS
+            db = self._client()
+            refs = [db.collection(COLLECTION).document(w) for w in missing]
+            try:
+                async for doc in db.get_all(refs, field_paths=_COUNTER_FIELDS):
+                    if not doc.exists:
+                        continue
+                    data = doc.to_dict()
+                    wallet_totals = (data.get("records_30d", 0), data.get("spend_30d_micros", 0))
+                    totals[doc.id] = wallet_totals
+                    reconciled_at = data.get("reconciled_at")
+                    if (
+                        "spend_30d_micros" in data
+                        and reconciled_at is not None
+                        and _datetime_to_ms(reconciled_at) > stale_before_ms
+                    ):
+                        self._totals[doc.id] = wallet_totals
+            except Exception as exc:
+                logger.warning("Volume tier batch lookup failed: %s", exc)
+
+        return {
+            w: get_volume_price(totals[w][0] if w in totals else 0)
+            for w in wallet_addresses
+        }
 
 
 # Singleton instance — connected to Firestore at startup via main.py